@@ -42,12 +42,13 @@ class User(AbstractUser):
     @property
     def basket_total_quantity(self) -> int:
         """
-        Property to calculate and return the total quantity of items in the user's basket.
+        Property to return the total quantity of items in the user's basket.
 
+        The value is served from the cache and recounted only when the basket has changed.
         """
-        from products.models import Basket
+        from products.cache import get_basket_quantity
 
-        return Basket.objects.total_quantity(self.pk)
+        return get_basket_quantity(self.pk)
 
 
 class PromoCode(models.Model):
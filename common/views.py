@@ -1,10 +1,66 @@
+import hashlib
+import re
+
+from django.conf import settings
 from django.contrib import messages
-from django.http import HttpRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+from django.utils.http import http_date, quote_etag
 from django.views.generic import TemplateView
 
 from accounts.models import PromoCode
-from products.filters import ProductFilter
-from products.models import Basket
+from products.cache import (
+    get_basket_quantity,
+    get_cached_page,
+    get_catalog_entry,
+    get_catalog_version,
+    get_navigation_version,
+    set_cached_page,
+)
+from products.filters import SORT_ORDERINGS, ProductFilter
+from products.guest_basket import GuestBasket
+from products.pagination import paginate_keyset
+from products.pricing import get_basket_pricing
+
+# The CSRF token of a cached page is swapped for the visitor's own token when the page is served
+CSRF_TOKEN_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[^"]*')
+CSRF_TOKEN_PLACEHOLDER = b"__csrf_token__"
+
+
+def get_promo_basket_pricing(request: HttpRequest) -> tuple:
+    """
+    Prices the user's basket with the promo code stored in the session.
+
+    Returns the promo code (or None) together with the basket pricing. If the promo code is no
+    longer valid for the user, it is removed from the session and the basket is priced without it.
+    """
+    promo_code_str = request.session.get("promo_code", None)
+    promo_code = None
+
+    if promo_code_str is not None:
+        promo_code = PromoCode.objects.filter(code=promo_code_str).first()
+
+    try:
+        return promo_code, get_basket_pricing(request, promo_code)
+    except ValueError:
+        messages.error(request, "Invalid promo code.")
+        del request.session["promo_code"]
+        return None, get_basket_pricing(request)
+
+
+def has_guest_basket(request: HttpRequest) -> bool:
+    """
+    Tells whether an anonymous visitor has items in their guest basket, which the header shows.
+    """
+    return not request.user.is_authenticated and bool(
+        GuestBasket.from_request(request).lines
+    )
 
 
 class TitleMixin:
@@ -28,20 +84,6 @@ class TitleMixin:
         return context
 
 
-class IndexView(TitleMixin, TemplateView):
-    """
-    A view that renders the main page (home page) with the title "Main page".
-
-    This view extends `TitleMixin` to include the dynamic title in the context
-    and uses the `TemplateView` to render the `home.html` template.
-    It also provides the `product_name_filter` to filter products on the page.
-    """
-
-    template_name = "home.html"
-    title = "Main page"
-    extra_context = {"product_name_filter": ProductFilter}
-
-
 class PromoCodeMixin:
     """
     A mixin for handling promo codes in the basket and during the checkout process.
@@ -52,28 +94,16 @@ class PromoCodeMixin:
 
     def setup(self, request: HttpRequest, *args, **kwargs) -> None:
         """
-        Retrieves the promo code from the session and calculates the total amount after applying it.
+        Retrieves the promo code from the session and prices the basket with it.
 
         This method checks if a valid promo code is stored in the session, and if so, retrieves the promo
-        code from the database and calculates the new total with the promo code applied.
+        code from the database. The basket is priced once, giving both the total before and after the
+        promo code, and the result is memoized on the request for the rest of the view.
         """
         self.promo_code_str = request.session.get("promo_code", None)
-        self.promo_code = None
-        self.total_after_promo = None
-
-        if self.promo_code_str is not None:
-            try:
-                self.promo_code = PromoCode.objects.filter(
-                    code=self.promo_code_str
-                ).first()
-                self.total_after_promo = Basket.objects.total_sum(
-                    request.user, self.promo_code
-                )
-            except (PromoCode.DoesNotExist, ValueError):
-                messages.error(request, "Invalid promo code.")
-                del request.session["promo_code"]
-
-        self.basket_total_sum = Basket.objects.total_sum(request.user)
+        self.promo_code, self.basket_pricing = get_promo_basket_pricing(request)
+        self.basket_total_sum = self.basket_pricing.total_sum
+        self.total_after_promo = self.basket_pricing.total_after_promo
         super().setup(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs) -> dict:
@@ -84,7 +114,237 @@ class PromoCodeMixin:
         the total sum after the promo code discount. It adds these values to the context for the view.
         """
         context = super().get_context_data(**kwargs)
+        context["basket_pricing"] = self.basket_pricing
         context["basket_total_sum"] = self.basket_total_sum
         if self.promo_code is not None:
             context["total_after_promo"] = self.total_after_promo
         return context
+
+
+class KeysetPaginationMixin:
+    """
+    A mixin for product list views that paginates with opaque cursors in (name, id) order,
+    or in the order of the chosen sort (by final price or review count, then id).
+
+    The cursor is read from the `cursor` query parameter. The page is exposed in the context as
+    `page_obj`, whose `next_cursor` and `previous_cursor` are used for the navigation links.
+    """
+
+    paginate_by = 24
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """
+        Returns the keyset page selected by the cursor, without counting rows or using OFFSET.
+        """
+        page = paginate_keyset(
+            queryset,
+            self.request.GET.get(self.cursor_kwarg),
+            page_size,
+            self.get_keyset_ordering(queryset),
+        )
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_keyset_ordering(self, queryset: QuerySet) -> str:
+        """
+        Returns the field the pages of the queryset are ordered by, following the `sort` query
+        parameter.
+        """
+        return SORT_ORDERINGS.get(self.request.GET.get("sort"), "name")
+
+
+class CatalogCacheMixin:
+    """
+    A mixin for product list views that serves the product list from the catalog cache.
+
+    The list (or the current page of it) is cached per view, URL kwargs and the query parameters
+    named in `catalog_cache_params`, and is rebuilt whenever `get_catalog_cache_version()` changes.
+    """
+
+    catalog_cache_params = ()
+
+    def get_catalog_cache_version(self) -> int | None:
+        """
+        Returns the version the product list is cached under, or None for the catalog version.
+        """
+        return None
+
+    def get_catalog_cache_parts(self) -> tuple:
+        """
+        Returns the values that identify this product list in the catalog cache.
+        """
+        return (
+            tuple(sorted(self.kwargs.items())),
+            tuple(self.request.GET.get(param) for param in self.catalog_cache_params),
+        )
+
+    def get_context_data(self, **kwargs) -> dict:
+        """
+        Replaces an unpaginated product list with its cached copy, evaluating it only on a miss.
+        """
+        object_list = kwargs.get("object_list", self.object_list)
+        if not self.get_paginate_by(object_list):
+            kwargs["object_list"] = get_catalog_entry(
+                type(self).__name__,
+                self.get_catalog_cache_parts(),
+                lambda: list(object_list),
+                version=self.get_catalog_cache_version(),
+            )
+        return super().get_context_data(**kwargs)
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        """
+        Returns the cached page, paginating the queryset only on a miss.
+        """
+        return get_catalog_entry(
+            type(self).__name__,
+            self.get_catalog_cache_parts(),
+            lambda: super(CatalogCacheMixin, self).paginate_queryset(
+                queryset, page_size
+            ),
+            version=self.get_catalog_cache_version(),
+        )
+
+
+class ConditionalGetMixin:
+    """
+    A mixin for catalog views that answers conditional GET requests with 304 Not Modified.
+
+    The ETag and Last-Modified headers are derived from `get_conditional_validators()` before the
+    view builds its context, so an unchanged page costs no template rendering and at most the
+    queries of the validators. The ETag also covers what the page shows of the visitor: their
+    account, basket badge and CSRF cookie.
+
+    Anonymous pages may be stored by shared caches, which must revalidate them every time; signed
+    in pages and pages showing a guest basket only by the browser. Requests carrying messages are always rendered and never stored,
+    as for the page cache.
+    """
+
+    def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        """
+        Answers with 304 if the client's copy is still current, or renders the page otherwise.
+        """
+        if messages.get_messages(request):
+            # A 304 would hide the messages, and a stored copy would show them again
+            response = super().get(request, *args, **kwargs)
+            patch_cache_control(response, private=True, no_store=True)
+            patch_vary_headers(response, ("Cookie",))
+            return response
+
+        validators = self.get_conditional_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        parts, last_modified = validators
+        etag_parts = parts
+        user = request.user
+        personal = user.is_authenticated or has_guest_basket(request)
+        if user.is_authenticated:
+            etag_parts += (user.pk, get_basket_quantity(user.pk))
+        elif personal:
+            etag_parts += (GuestBasket.from_request(request).total_quantity(),)
+        if personal:
+            # The basket badge may change without the page's data changing, so dates are not enough
+            last_modified = None
+        etag_parts += (request.COOKIES.get(settings.CSRF_COOKIE_NAME),)
+        etag = quote_etag(
+            hashlib.md5(repr((type(self).__name__, etag_parts)).encode()).hexdigest()
+        )
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = self.get_page(parts, request, *args, **kwargs)
+        response.headers["ETag"] = etag
+        if last_modified is not None:
+            response.headers["Last-Modified"] = http_date(last_modified)
+        if personal:
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+        # The page embeds a CSRF token and the header depends on the session
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+    def get_conditional_validators(self) -> tuple[tuple, int] | None:
+        """
+        Returns the values the page depends on and its modification time as a Unix timestamp,
+        or None to always render the page.
+
+        By default the page depends on the whole catalog.
+        """
+        version = get_catalog_version()
+        return (version,), version // 10**9
+
+    def get_page(
+        self, parts: tuple, request: HttpRequest, *args, **kwargs
+    ) -> HttpResponse:
+        """
+        Returns the full page, whose data is identified by the validator `parts`.
+        """
+        return super().get(request, *args, **kwargs)
+
+
+class AnonymousPageCacheMixin(ConditionalGetMixin):
+    """
+    A mixin for catalog views that serves whole pages to anonymous visitors from the cache.
+
+    Pages are cached per view, path with query string and validator parts, that is the versions
+    of the data they show, so editing a product only purges the pages that list it. Signed in
+    visitors, guests with a basket and requests carrying messages are always rendered.
+    """
+
+    def get_page(
+        self, parts: tuple, request: HttpRequest, *args, **kwargs
+    ) -> HttpResponse:
+        """
+        Returns the cached page, rendering and caching it on a miss.
+        """
+        if (
+            request.user.is_authenticated
+            or has_guest_basket(request)
+            or messages.get_messages(request)
+        ):
+            return super().get_page(parts, request, *args, **kwargs)
+
+        key_parts = (type(self).__name__, request.get_full_path(), parts)
+        cached = get_cached_page(key_parts)
+        if cached is not None:
+            content, content_type = cached
+            return HttpResponse(
+                content.replace(CSRF_TOKEN_PLACEHOLDER, get_token(request).encode()),
+                content_type=content_type,
+            )
+
+        response = super().get_page(parts, request, *args, **kwargs)
+        if response.status_code == 200:
+            response.render()
+            set_cached_page(
+                key_parts,
+                CSRF_TOKEN_RE.sub(rb"\g<1>" + CSRF_TOKEN_PLACEHOLDER, response.content),
+                response["Content-Type"],
+            )
+        return response
+
+
+class IndexView(TitleMixin, AnonymousPageCacheMixin, TemplateView):
+    """
+    A view that renders the main page (home page) with the title "Main page".
+
+    This view extends `TitleMixin` to include the dynamic title in the context
+    and uses the `TemplateView` to render the `home.html` template.
+    It also provides the `product_name_filter` to filter products on the page.
+    The page only shows the navigation, so it is cached until the categories change.
+    """
+
+    template_name = "home.html"
+    title = "Main page"
+    extra_context = {"product_name_filter": ProductFilter}
+
+    def get_conditional_validators(self) -> tuple[tuple, int]:
+        """
+        Makes the page depend on the navigation only.
+        """
+        version = get_navigation_version()
+        return (version,), version // 10**9
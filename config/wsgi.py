@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
 application = get_wsgi_application()
+
+# Imported once Django is set up; the in-process indexes are built before the first request
+from products.autocomplete import warm_indexes  # noqa: E402
+
+warm_indexes()
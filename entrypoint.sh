@@ -12,10 +12,9 @@ echo "Applying database migrations..."
 poetry run python manage.py migrate
 poetry run python manage.py create_groups
 
-apk add --no-cache postgresql-client
-
 echo "Loading initial data..."
-poetry run python manage.py dbshell < categories-products-data.sql || echo "Failed to load SQL data"
+poetry run python manage.py load_seed_data
+poetry run python manage.py generate_image_variants
 
 echo "Starting Django server..."
 exec poetry run python manage.py runserver 0.0.0.0:8000
@@ -6,6 +6,7 @@ from django.core.exceptions import ValidationError
 from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 from accounts.models import User
+from products.cache import invalidate_basket_quantity
 
 
 class Order(models.Model):
@@ -71,5 +72,6 @@ class Order(models.Model):
 
         # Delete the user's basket items
         self.initiator.baskets.all().delete()
+        invalidate_basket_quantity(self.initiator.pk)
 
         super().save(*args, **kwargs)
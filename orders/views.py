@@ -7,7 +7,6 @@ from common.views import PromoCodeMixin, TitleMixin
 from .forms import OrderForm
 from .models import Order
 from products.filters import ProductFilter
-from products.models import Basket
 
 
 class OrderCreateView(PromoCodeMixin, TitleMixin, LoginRequiredMixin, CreateView):
@@ -31,7 +30,7 @@ class OrderCreateView(PromoCodeMixin, TitleMixin, LoginRequiredMixin, CreateView
 
         If no products are added to the basket, a 404 error is raised.
         """
-        if not request.user.baskets.all():
+        if not self.basket_pricing.lines:
             raise Http404("No products added to basket")
         return super().dispatch(request, *args, **kwargs)
 
@@ -43,16 +42,11 @@ class OrderCreateView(PromoCodeMixin, TitleMixin, LoginRequiredMixin, CreateView
         applying the promo code (if any), and saves the basket history.
         """
         form.instance.initiator = self.request.user
+        form.instance.basket_history = self.basket_pricing.json()
+        form.instance.total_sum = self.basket_pricing.total
         if self.promo_code is not None:
-            form.instance.basket_history = Basket.objects.json(
-                self.request.user, self.promo_code
-            )
             form.instance.promo_code = self.promo_code
-            form.instance.total_sum = self.total_after_promo
             del self.request.session["promo_code"]
-        else:
-            form.instance.total_sum = self.basket_total_sum
-            form.instance.basket_history = Basket.objects.json(self.request.user)
 
         return super().form_valid(form)
 
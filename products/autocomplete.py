@@ -0,0 +1,109 @@
+from bisect import bisect_left
+
+from django.db import connection
+from django.urls import reverse
+
+from products.cache import get_search_version
+from products.models import Product, ProductCategory
+from products.search import get_search_index, tokenize
+
+AUTOCOMPLETE_LIMIT = 10
+
+_index = None
+
+
+class PrefixIndex:
+    """
+    An in-memory, sorted-array prefix index over product and category names.
+
+    Every word start of a name is stored as a key ("milk hazelnut bar", "hazelnut bar", "bar"), so
+    a query matches names containing a word that starts with it. Lookups are a binary search
+    followed by a short scan, and never reach the database.
+    """
+
+    def __init__(self, entries: list[dict]) -> None:
+        """
+        Indexes the given entries, each a dictionary with at least a "name".
+        """
+        self.entries = entries
+        keys = []
+        for position, entry in enumerate(entries):
+            words = tokenize(entry["name"])
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), position))
+        keys.sort()
+        self.keys = [key for key, _ in keys]
+        self.positions = [position for _, position in keys]
+
+    def search(self, query: str, limit: int = AUTOCOMPLETE_LIMIT) -> list[dict]:
+        """
+        Returns up to `limit` entries whose names have a word sequence starting with the query.
+        """
+        prefix = " ".join(tokenize(query))
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        position = bisect_left(self.keys, prefix)
+        while (
+            position < len(self.keys)
+            and self.keys[position].startswith(prefix)
+            and len(results) < limit
+        ):
+            entry = self.positions[position]
+            if entry not in seen:
+                seen.add(entry)
+                results.append(self.entries[entry])
+            position += 1
+        return results
+
+
+def build_autocomplete_index() -> PrefixIndex:
+    """
+    Builds the prefix index from all category and product names.
+    """
+    entries = [
+        {
+            "name": name,
+            "type": "category",
+            "url": reverse("category_products", args=[slug]),
+        }
+        for name, slug in ProductCategory.objects.values_list("name", "slug")
+    ]
+    entries += [
+        {
+            "name": name,
+            "type": "product",
+            "url": reverse("product_detail", args=[slug]),
+        }
+        for name, slug in Product.objects.values_list("name", "slug").iterator(
+            chunk_size=2000
+        )
+    ]
+    return PrefixIndex(entries)
+
+
+def get_autocomplete_index() -> PrefixIndex:
+    """
+    Returns the prefix index, rebuilt in this process when product or category names change.
+    """
+    global _index
+    version = get_search_version()
+    if _index is None or _index[0] != version:
+        _index = (version, build_autocomplete_index())
+    return _index[1]
+
+
+def warm_indexes() -> None:
+    """
+    Builds the autocomplete index, and the search index where PostgreSQL does not search, so
+    that the first keystrokes after the server starts do not wait for them.
+    """
+    try:
+        get_autocomplete_index()
+        if connection.vendor != "postgresql":
+            get_search_index()
+    finally:
+        # The server threads open their own connections
+        connection.close()
@@ -0,0 +1,326 @@
+import hashlib
+import time
+from collections import Counter
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from products.models import Basket, Product
+
+BASKET_QUANTITY_KEY = "basket_quantity:{user_pk}"
+BASKET_QUANTITY_TIMEOUT = 60 * 60
+
+CATALOG_VERSION_KEY = "catalog_version"
+NAVIGATION_VERSION_KEY = "navigation_version"
+SEARCH_VERSION_KEY = "search_version"
+REVIEWS_VERSION_KEY = "reviews_version"
+CATEGORY_VERSION_KEY = "category_version:{pk}"
+CATALOG_ENTRY_KEY = "catalog:{version}:{name}:{digest}"
+CATALOG_STATS_KEY = "catalog_stats:{counter}"
+CATALOG_TIMEOUT = 60 * 60 * 24
+
+PAGE_KEY = "page:{digest}"
+PAGE_TIMEOUT = 60 * 60 * 24
+
+# Template fragments cached with the `fragment_cache` tag, see products.templatetags.fragment_cache
+FRAGMENT_NAMES = ("product_card", "products_navigation")
+FRAGMENT_STATS_KEY = "fragment_stats:{name}:{counter}"
+FRAGMENT_STATS_FLUSH_EVERY = 100
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+# Fragment lookups counted in this process and not yet added to the shared counters
+_fragment_counts = Counter()
+
+
+def is_cache_shared() -> bool:
+    """
+    Returns whether the default cache backend is shared between processes.
+
+    Versions and hit counters kept in a per-process backend are invisible to other workers and
+    to management commands, so they are only meaningful with a backend such as Redis.
+    """
+    return not isinstance(caches["default"], (DummyCache, LocMemCache))
+
+
+def get_basket_quantity(user_pk: int) -> int:
+    """
+    Returns the number of items in the user's basket, as shown on the header badge.
+
+    The value is kept in the cache backend and only recounted with a single `Sum()` query
+    when it is missing.
+    """
+    key = BASKET_QUANTITY_KEY.format(user_pk=user_pk)
+    quantity = cache.get(key)
+    if quantity is None:
+        quantity = Basket.objects.total_quantity(user_pk)
+        cache.set(key, quantity, BASKET_QUANTITY_TIMEOUT)
+    return quantity
+
+
+def invalidate_basket_quantity(user_pk: int) -> None:
+    """
+    Drops the cached basket quantity after the user's basket has changed.
+    """
+    cache.delete(BASKET_QUANTITY_KEY.format(user_pk=user_pk))
+
+
+def set_basket_quantity(user_pk: int, quantity: int) -> None:
+    """
+    Stores an already known basket quantity, sparing the next page a recount.
+    """
+    cache.set(
+        BASKET_QUANTITY_KEY.format(user_pk=user_pk), quantity, BASKET_QUANTITY_TIMEOUT
+    )
+
+
+def invalidate_basket_quantities(user_pks) -> None:
+    """
+    Drops the cached basket quantities of several users at once.
+    """
+    cache.delete_many(
+        [BASKET_QUANTITY_KEY.format(user_pk=user_pk) for user_pk in set(user_pks)]
+    )
+
+
+def get_catalog_version() -> int:
+    """
+    Returns the current catalog version, which changes whenever the catalog is edited.
+
+    Versions are the time of the change in nanoseconds, so they also serve as modification dates.
+    """
+    return _get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version() -> None:
+    """
+    Moves the catalog to a new version, so every cached catalog entry is stale.
+    """
+    cache.set(CATALOG_VERSION_KEY, time.time_ns(), None)
+
+
+def get_search_version() -> int:
+    """
+    Returns the version of the product and category texts held by the in-process search and
+    autocomplete indexes, which changes only when those texts are edited.
+    """
+    return _get_version(SEARCH_VERSION_KEY)
+
+
+def bump_search_version() -> None:
+    """
+    Moves the searched texts to a new version, so every process rebuilds its indexes.
+    """
+    cache.set(SEARCH_VERSION_KEY, time.time_ns(), None)
+
+
+def get_navigation_version() -> int:
+    """
+    Returns the version of the categories and groups shown in the navigation of every page.
+    """
+    return _get_version(NAVIGATION_VERSION_KEY)
+
+
+def bump_navigation_version() -> None:
+    """
+    Moves the navigation, and with it the whole catalog and the searched texts, to a new version.
+
+    As the navigation is on every page, this also purges every cached page; bulk writes that may
+    touch any page use it for that reason.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {
+            CATALOG_VERSION_KEY: version,
+            NAVIGATION_VERSION_KEY: version,
+            SEARCH_VERSION_KEY: version,
+        },
+        None,
+    )
+
+
+def get_category_version(pk: int) -> int:
+    """
+    Returns the version of a category's product list, which changes whenever one of its
+    products is edited, added or removed.
+    """
+    return _get_version(CATEGORY_VERSION_KEY.format(pk=pk))
+
+
+def bump_category_versions(pks) -> None:
+    """
+    Moves the product lists of several categories to a new version.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {CATEGORY_VERSION_KEY.format(pk=pk): version for pk in set(pks)}, None
+    )
+
+
+def get_reviews_version() -> int:
+    """
+    Returns the version of the review counts shown by the list of all products, which changes
+    whenever a product is reviewed.
+    """
+    return _get_version(REVIEWS_VERSION_KEY)
+
+
+def bump_product_versions(product_pk: int) -> None:
+    """
+    Moves the categories listing a product and the review counts to a new version, after the
+    product's reviews changed.
+
+    The rest of the catalog is left alone; the product page follows the product's `updated_at`,
+    which the review views set.
+    """
+    category_pks = Product.categories.through.objects.filter(
+        product_id=product_pk
+    ).values_list("productcategory_id", flat=True)
+    version = time.time_ns()
+    cache.set_many(
+        {
+            REVIEWS_VERSION_KEY: version,
+            **{CATEGORY_VERSION_KEY.format(pk=pk): version for pk in category_pks},
+        },
+        None,
+    )
+
+
+def get_cached_page(parts: tuple) -> tuple | None:
+    """
+    Returns the (content, content type) of the page identified by `parts`, or None on a miss.
+
+    The parts include the versions of the data the page shows, so a page is purged by moving
+    any of them to a new version.
+    """
+    return cache.get(_page_key(parts))
+
+
+def set_cached_page(parts: tuple, content: bytes, content_type: str) -> None:
+    """
+    Stores the content of the page identified by `parts`.
+    """
+    cache.set(_page_key(parts), (content, content_type), PAGE_TIMEOUT)
+
+
+def _page_key(parts: tuple) -> str:
+    """Returns the cache key of a page."""
+    return PAGE_KEY.format(digest=hashlib.md5(repr(parts).encode()).hexdigest())
+
+
+def _get_version(key: str) -> int:
+    """Returns the version stored under `key`, starting a new one if it was evicted."""
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(key, version, None)
+    return version
+
+
+def get_catalog_entry(name: str, parts: tuple, build, version: int | None = None):
+    """
+    Returns the cached catalog data identified by `name` and `parts` for the current catalog version,
+    or for `version` if the data depends on less than the whole catalog.
+
+    On a miss, `build` is called to compute the data, which is then cached. Hits and misses are
+    counted in the cache so they can be inspected with `catalog_cache_stats`.
+    """
+    if version is None:
+        version = get_catalog_version()
+    digest = hashlib.md5(repr(parts).encode()).hexdigest()
+    key = CATALOG_ENTRY_KEY.format(version=version, name=name, digest=digest)
+    value = cache.get(key)
+    if value is not None:
+        _count("hits")
+        return value
+
+    _count("misses")
+    value = build()
+    cache.set(key, value, CATALOG_TIMEOUT)
+    return value
+
+
+def get_catalog_cache_stats() -> dict:
+    """
+    Returns the catalog cache hit and miss counters.
+    """
+    keys = {
+        counter: CATALOG_STATS_KEY.format(counter=counter)
+        for counter in ("hits", "misses")
+    }
+    values = cache.get_many(keys.values())
+    return {counter: values.get(key, 0) for counter, key in keys.items()}
+
+
+def reset_catalog_cache_stats() -> None:
+    """
+    Resets the catalog cache hit and miss counters.
+    """
+    cache.delete_many([CATALOG_STATS_KEY.format(counter=c) for c in ("hits", "misses")])
+
+
+def _count(counter: str) -> None:
+    """Increments one of the catalog cache counters."""
+    key = CATALOG_STATS_KEY.format(counter=counter)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None)
+
+
+def count_fragment_lookup(name: str, hit: bool) -> None:
+    """
+    Counts a lookup of a cached template fragment.
+
+    A listing page looks up one fragment per product, so the counts are kept in the process and
+    added to the shared counters every `FRAGMENT_STATS_FLUSH_EVERY` lookups, rather than costing
+    a cache round trip each.
+    """
+    _fragment_counts[name, "hits" if hit else "misses"] += 1
+    if _fragment_counts.total() >= FRAGMENT_STATS_FLUSH_EVERY:
+        flush_fragment_stats()
+
+
+def flush_fragment_stats() -> None:
+    """
+    Adds the fragment lookups counted in this process to the shared counters.
+    """
+    counts = dict(_fragment_counts)
+    _fragment_counts.clear()
+    for (name, counter), count in counts.items():
+        key = FRAGMENT_STATS_KEY.format(name=name, counter=counter)
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            if not cache.add(key, count, None):
+                cache.incr(key, count)
+
+
+def get_fragment_cache_stats() -> dict:
+    """
+    Returns the hit and miss counters of every cached template fragment, by fragment name.
+    """
+    keys = {
+        (name, counter): FRAGMENT_STATS_KEY.format(name=name, counter=counter)
+        for name in FRAGMENT_NAMES
+        for counter in ("hits", "misses")
+    }
+    values = cache.get_many(keys.values())
+    stats = {name: {"hits": 0, "misses": 0} for name in FRAGMENT_NAMES}
+    for (name, counter), key in keys.items():
+        stats[name][counter] = values.get(key, 0)
+    return stats
+
+
+def reset_fragment_cache_stats() -> None:
+    """
+    Resets the hit and miss counters of the cached template fragments.
+    """
+    _fragment_counts.clear()
+    cache.delete_many(
+        [
+            FRAGMENT_STATS_KEY.format(name=name, counter=counter)
+            for name in FRAGMENT_NAMES
+            for counter in ("hits", "misses")
+        ]
+    )
@@ -0,0 +1,20 @@
+from django.core.checks import Warning, register
+
+from products.cache import is_cache_shared
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Warns when the default cache is local to each process, as the catalog versions and the cache
+    counters would then differ between workers.
+    """
+    if is_cache_shared():
+        return []
+    return [
+        Warning(
+            "The default cache backend is not shared between processes.",
+            hint="Set CACHE_URL to a Redis server, e.g. rediscache://cache:6379/1.",
+            id="products.W001",
+        )
+    ]
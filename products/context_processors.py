@@ -0,0 +1,12 @@
+from django.http import HttpRequest
+
+from products.guest_basket import GuestBasket
+
+
+def guest_basket(request: HttpRequest) -> dict:
+    """
+    Adds the item count of the guest basket, shown in the header to visitors who are not signed in.
+    """
+    if request.user.is_authenticated:
+        return {}
+    return {"guest_basket_quantity": GuestBasket.from_request(request).total_quantity()}
@@ -1,50 +1,138 @@
 import django_filters
-from django.db.models import Subquery
+from django.db.models import Count, QuerySet
 from django import forms
 from django_filters.widgets import LinkWidget
 
+from .cache import get_catalog_entry
 from .models import ProductCategory, Product
+from .search import search_products
 
 
-def available_types(request):
+# Sort options of the product lists, mapped to the keyset ordering they use (see products.pagination)
+SORT_CHOICES = [
+    ("price", "Price: low to high"),
+    ("-price", "Price: high to low"),
+    ("-reviews", "Most reviewed"),
+]
+SORT_ORDERINGS = {
+    "price": "final_price",
+    "-price": "-final_price",
+    "-reviews": "-review_count",
+}
+
+
+def build_type_facets() -> dict:
+    """
+    Builds the "Type" facet index in a single query.
+
+    Maps every category slug to the categories of the group named "Type" that its products belong to,
+    as a list of (slug, name, product count) tuples ordered by name.
+    """
+    rows = (
+        ProductCategory.objects.filter(group__name="Type")
+        .values("slug", "name", "products__categories__slug")
+        .annotate(product_count=Count("products", distinct=True))
+        .order_by("name")
+    )
+    facets = {}
+    for row in rows:
+        facets.setdefault(row["products__categories__slug"], []).append(
+            (row["slug"], row["name"], row["product_count"])
+        )
+    return facets
+
+
+def type_facets(category_slug: str) -> list[tuple]:
+    """
+    Returns the available "Type" categories of a category with their product counts.
+
+    The facet index is computed once per catalog version and served from the catalog cache.
+    """
+    return get_catalog_entry("type_facets", (), build_type_facets).get(
+        category_slug, []
+    )
+
+
+class CatalogLinkWidget(LinkWidget):
+    """
+    A `LinkWidget` whose links drop the pagination cursor, so picking a filter starts from the first page.
+    """
+
+    def value_from_datadict(self, data, files, name):
+        value = super().value_from_datadict(data, files, name)
+        self.data = data.copy()
+        self.data.pop("cursor", None)
+        return value
+
+
+class PriceFilterSet(django_filters.FilterSet):
     """
-    Retrieves the available product categories of a certain type based on the slug provided in the request.
-    Filters categories that are associated with products belonging to a specific category group named "Type".
+    A base filter set adding a price range and sorting by price or review count to product lists.
+
+    All of it runs against the indexed `final_price` and `review_count` columns.
     """
-    format = request.resolver_match.kwargs.get("slug")
-    product_ids = Product.objects.filter(categories__slug=format).values("id")
-    return ProductCategory.objects.filter(
-        products__in=Subquery(product_ids), group__name="Type"
-    ).distinct()
 
+    min_price = django_filters.NumberFilter(
+        field_name="final_price", lookup_expr="gte", label="Price from"
+    )
+    max_price = django_filters.NumberFilter(
+        field_name="final_price", lookup_expr="lte", label="Price to"
+    )
+    sort = django_filters.ChoiceFilter(
+        method="sort_products",
+        choices=SORT_CHOICES,
+        empty_label="Sort by name",
+        label="Sort",
+    )
+
+    def sort_products(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        """
+        Orders the products by the chosen column, breaking ties by id in the same direction.
+        """
+        ordering = SORT_ORDERINGS[value]
+        tie_breaker = "-id" if ordering.startswith("-") else "id"
+        return queryset.order_by(ordering, tie_breaker)
 
-class ProductFilterByType(django_filters.FilterSet):
+
+class ProductFilterByType(PriceFilterSet):
     """
     A filter set for filtering products by category type.
     This filter allows users to filter products based on their associated category type.
 
-    The filter uses a `ModelChoiceFilter` to allow selecting a category type from a list of available product categories.
+    The choices are the "Type" categories available in the current category, labelled with their product
+    counts and taken from the precomputed facet index, so rendering the links costs no query.
     """
 
-    type = django_filters.ModelChoiceFilter(
-        field_name="categories",
-        queryset=available_types,
-        to_field_name="slug",
-        widget=LinkWidget(),
+    type = django_filters.ChoiceFilter(
+        field_name="categories__slug",
+        label="Product categories",
+        widget=CatalogLinkWidget(),
     )
 
     class Meta:
-        fields = ["type"]
+        fields = ["type", "min_price", "max_price", "sort"]
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Fills the type choices from the facet index of the category in the URL.
+        """
+        super().__init__(*args, **kwargs)
+        category_slug = self.request.resolver_match.kwargs.get("slug")
+        self.filters["type"].extra["choices"] = [
+            (slug, f"{name} ({count})")
+            for slug, name, count in type_facets(category_slug)
+        ]
 
 
 class ProductFilter(django_filters.FilterSet):
     """
-    A filter set for searching products by name.
-    This filter allows users to search for products by their name with an 'icontains' lookup expression.
+    A filter set for searching products.
+    This filter matches the search words against product names, descriptions and ingredients,
+    and orders the results by relevance (see `products.search`).
     """
 
     name = django_filters.CharFilter(
-        lookup_expr="icontains",
+        method="search",
         widget=forms.TextInput(
             attrs={
                 "class": "search-field",
@@ -56,3 +144,19 @@ class ProductFilter(django_filters.FilterSet):
     class Meta:
         model = Product
         fields = ["name"]
+
+    def search(self, queryset: QuerySet, name: str, value: str) -> QuerySet:
+        """
+        Applies the full-text product search.
+        """
+        return search_products(queryset, value)
+
+
+class ProductListFilter(PriceFilterSet, ProductFilter):
+    """
+    The filter set of the product list page: the product search with the price filters.
+    The navigation search form keeps using `ProductFilter` alone.
+    """
+
+    class Meta(ProductFilter.Meta):
+        fields = ["name", "min_price", "max_price", "sort"]
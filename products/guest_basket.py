@@ -0,0 +1,156 @@
+import secrets
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from products.managers import MAX_BASKET_QUANTITY
+from products.models import Basket, Product
+
+GUEST_BASKET_COOKIE = "guest_basket"
+GUEST_BASKET_SALT = "products.guest_basket"
+GUEST_BASKET_KEY = "guest_basket:{token}"
+GUEST_BASKET_TIMEOUT = 60 * 60 * 24 * 14
+
+
+class GuestBasket:
+    """
+    A basket for visitors who are not signed in.
+
+    The basket lines are a {product_id: quantity} mapping kept in the cache backend under a random
+    token, and the token travels in a signed cookie, so guest baskets never touch the database.
+    It exposes the same reading interface as `BasketQuerySet` (`total_sum`, `total_quantity`,
+    `json`); the `user` argument of those methods is accepted for compatibility and ignored.
+    """
+
+    def __init__(self, token: str | None = None) -> None:
+        """
+        Loads the basket lines stored under the given token, if any.
+        """
+        self.token = token
+        self.lines = {}
+        if token is not None:
+            self.lines = cache.get(GUEST_BASKET_KEY.format(token=token)) or {}
+
+    @classmethod
+    def from_request(cls, request: HttpRequest) -> "GuestBasket":
+        """
+        Returns the guest basket referenced by the request's signed cookie, loaded at most once
+        per request.
+        """
+        guest_basket = getattr(request, "_guest_basket", None)
+        if guest_basket is None:
+            token = request.get_signed_cookie(
+                GUEST_BASKET_COOKIE, default=None, salt=GUEST_BASKET_SALT
+            )
+            guest_basket = request._guest_basket = cls(token)
+        return guest_basket
+
+    def add_product(self, product_id: int, quantity: int) -> int:
+        """
+        Adds `quantity` (which may be negative) of a product and returns the new quantity.
+        The line is removed once its quantity drops to zero and capped at `MAX_BASKET_QUANTITY`.
+        """
+        new_quantity = min(
+            self.lines.get(product_id, 0) + quantity, MAX_BASKET_QUANTITY
+        )
+        if new_quantity > 0:
+            self.lines[product_id] = new_quantity
+        else:
+            self.lines.pop(product_id, None)
+        return max(new_quantity, 0)
+
+    def set_quantities(self, quantities: dict) -> None:
+        """
+        Sets the quantities of several lines from a {product_id: quantity} mapping.
+        """
+        for product_id, quantity in quantities.items():
+            if quantity > 0:
+                self.lines[product_id] = min(quantity, MAX_BASKET_QUANTITY)
+            else:
+                self.lines.pop(product_id, None)
+
+    def save(self, response: HttpResponse) -> None:
+        """
+        Stores the basket lines in the cache and sets the signed cookie on the response.
+        """
+        if self.token is None:
+            self.token = secrets.token_urlsafe(16)
+            response.set_signed_cookie(
+                GUEST_BASKET_COOKIE,
+                self.token,
+                salt=GUEST_BASKET_SALT,
+                max_age=GUEST_BASKET_TIMEOUT,
+                httponly=True,
+                samesite="Lax",
+            )
+        cache.set(
+            GUEST_BASKET_KEY.format(token=self.token), self.lines, GUEST_BASKET_TIMEOUT
+        )
+
+    def clear(self) -> None:
+        """
+        Empties the basket and drops it from the cache.
+        """
+        self.lines = {}
+        if self.token is not None:
+            cache.delete(GUEST_BASKET_KEY.format(token=self.token))
+
+    def baskets(self) -> list[Basket]:
+        """
+        Returns unsaved `Basket` instances for the lines whose products still exist.
+        """
+        products = Product.objects.in_bulk(self.lines.keys())
+        return [
+            Basket(product=products[product_id], quantity=quantity)
+            for product_id, quantity in self.lines.items()
+            if product_id in products
+        ]
+
+    def total_sum(self, user=None, promo_code=None) -> Decimal:
+        """
+        Returns the total sum of all items in the guest basket.
+        """
+        self._check_promo_code(promo_code)
+        total = Decimal(sum(basket.sum() for basket in self.baskets()))
+        return total.quantize(Decimal("0.05"), rounding=ROUND_HALF_UP)
+
+    def total_quantity(self, user=None) -> int:
+        """
+        Returns the total quantity of all items in the guest basket.
+        """
+        return sum(self.lines.values())
+
+    def json(self, user=None, promo_code=None) -> list[dict]:
+        """
+        Returns the guest basket as a JSON-like list.
+        """
+        self._check_promo_code(promo_code)
+        return [basket.de_json() for basket in self.baskets()]
+
+    def _check_promo_code(self, promo_code) -> None:
+        """
+        Promo codes are tracked per user, so they cannot be applied to a guest basket.
+        """
+        if promo_code is not None:
+            raise ValueError("Promo codes require a signed-in user.")
+
+
+def merge_guest_basket(request: HttpRequest, user) -> None:
+    """
+    Moves the request's guest basket into the user's database basket with one bulk upsert.
+    """
+    guest_basket = GuestBasket.from_request(request)
+    if not guest_basket.lines:
+        return
+
+    existing = set(
+        Product.objects.filter(pk__in=guest_basket.lines.keys()).values_list(
+            "pk", flat=True
+        )
+    )
+    Basket.objects.merge_quantities(
+        user,
+        {pk: quantity for pk, quantity in guest_basket.lines.items() if pk in existing},
+    )
+    guest_basket.clear()
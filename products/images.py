@@ -0,0 +1,113 @@
+import base64
+import hashlib
+import io
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils.text import slugify
+from PIL import Image, ImageFilter, ImageOps, features
+
+# Widths of the resized copies, in pixels
+VARIANT_WIDTHS = (320, 640, 960)
+# Formats in order of preference; AVIF needs a Pillow built with libavif
+VARIANT_FORMATS = tuple(fmt for fmt in ("avif", "webp") if features.check(fmt))
+# Encoder options per format; AVIF at its default speed is several times slower than WebP
+VARIANT_SAVE_OPTIONS = {"avif": {"quality": 50, "speed": 8}, "webp": {"quality": 75}}
+VARIANT_DIR = "products_images/variants"
+# Width of the blurred placeholder inlined in the pages; a few hundred bytes once encoded
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_FORMAT = "webp" if features.check("webp") else "jpeg"
+
+
+def variant_widths(width: int) -> list[int]:
+    """
+    Returns the widths to generate for an image of the given width, never upscaling it.
+    """
+    widths = [variant for variant in VARIANT_WIDTHS if variant < width]
+    return list(dict.fromkeys(widths + [min(width, VARIANT_WIDTHS[-1])]))
+
+
+def build_image_variants(image_name: str) -> dict:
+    """
+    Writes resized copies of a product image in every variant format and returns their metadata.
+
+    The metadata has the form {"source": image name, "width": ..., "height": ..., "formats":
+    {format: [[file name, width, height], ...]}, "placeholder": data URI, "color": "#rrggbb"},
+    with the variants ordered by width. It is stored on `Product.image_variants` and read by
+    the `product_picture` template tag. Raises `OSError` if the image cannot be read.
+    """
+    with default_storage.open(image_name, "rb") as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image.load()
+    image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    digest = hashlib.md5(image_name.encode()).hexdigest()[:8]
+    prefix = f"{VARIANT_DIR}/{slugify(PurePosixPath(image_name).stem)}-{digest}"
+    formats = {fmt: [] for fmt in VARIANT_FORMATS}
+    for width in variant_widths(image.width):
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        for fmt in VARIANT_FORMATS:
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), **VARIANT_SAVE_OPTIONS[fmt])
+            name = f"{prefix}-{width}w.{fmt}"
+            default_storage.delete(name)
+            name = default_storage.save(name, ContentFile(buffer.getvalue()))
+            formats[fmt].append([name, width, height])
+
+    return {
+        "source": image_name,
+        "width": image.width,
+        "height": image.height,
+        "formats": formats,
+        **build_image_placeholder(image),
+    }
+
+
+def build_image_placeholder(image: Image.Image) -> dict:
+    """
+    Returns a tiny blurred copy of an image as a data URI and its dominant color.
+
+    Both are shown behind the image while it loads. A transparent image would let them show
+    through once loaded, so it gets empty values.
+    """
+    if image.mode == "RGBA":
+        return {"placeholder": "", "color": ""}
+
+    height = max(1, round(image.height * PLACEHOLDER_WIDTH / image.width))
+    thumbnail = image.resize((PLACEHOLDER_WIDTH, height), Image.Resampling.BOX)
+    buffer = io.BytesIO()
+    thumbnail.filter(ImageFilter.GaussianBlur(1)).save(
+        buffer, PLACEHOLDER_FORMAT.upper(), quality=40
+    )
+    encoded = base64.b64encode(buffer.getvalue()).decode()
+
+    # The most frequent color of a reduced palette, rather than the average, which turns muddy
+    palette = image.resize((64, 64), Image.Resampling.BOX).quantize(colors=8)
+    _, index = max(palette.getcolors())
+    red, green, blue = palette.getpalette()[index * 3 : index * 3 + 3]
+
+    return {
+        "placeholder": f"data:image/{PLACEHOLDER_FORMAT};base64,{encoded}",
+        "color": f"#{red:02x}{green:02x}{blue:02x}",
+    }
+
+
+def needs_image_variants(product) -> bool:
+    """
+    Tells whether the product's image variants are missing, were made from another image,
+    predate the placeholder or have lost their files, as on a fresh media directory.
+
+    Only the first file of each format is looked up in the storage, as they are written together.
+    """
+    variants = product.image_variants
+    if not product.image:
+        return False
+    if variants.get("source") != product.image.name or "placeholder" not in variants:
+        return True
+    return not all(
+        default_storage.exists(files[0][0])
+        for files in variants.get("formats", {}).values()
+        if files
+    )
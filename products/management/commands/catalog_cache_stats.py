@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from products.cache import (
+    get_catalog_cache_stats,
+    get_catalog_version,
+    get_fragment_cache_stats,
+    is_cache_shared,
+    reset_catalog_cache_stats,
+    reset_fragment_cache_stats,
+)
+
+
+class Command(BaseCommand):
+    help = "Show the catalog and template fragment cache hit and miss counters"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after showing them.",
+        )
+
+    def handle(self, *args, **kwargs):
+        if not is_cache_shared():
+            raise CommandError(
+                "The default cache backend is local to each process, so the counters of the "
+                "running server cannot be read from here. Set CACHE_URL to a shared cache."
+            )
+
+        self.stdout.write(f"Catalog version: {get_catalog_version()}")
+        self.write_stats("Catalog entries", get_catalog_cache_stats())
+        # Fragment lookups are added to the counters in batches, see count_fragment_lookup
+        for name, stats in get_fragment_cache_stats().items():
+            self.write_stats(f"Fragment {name}", stats)
+
+        if kwargs["reset"]:
+            reset_catalog_cache_stats()
+            reset_fragment_cache_stats()
+            self.stdout.write(self.style.SUCCESS("Counters have been reset."))
+
+    def write_stats(self, label: str, stats: dict) -> None:
+        """
+        Writes the hit and miss counters of one cache with its hit ratio.
+        """
+        lookups = stats["hits"] + stats["misses"]
+        ratio = stats["hits"] / lookups if lookups else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{label}: hits: {stats['hits']}, misses: {stats['misses']}, "
+                f"hit ratio: {ratio:.1%}"
+            )
+        )
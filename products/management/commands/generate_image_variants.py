@@ -0,0 +1,77 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+
+from products.cache import bump_navigation_version
+from products.images import build_image_variants, needs_image_variants
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = "Generate resized WebP/AVIF copies of product images in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Regenerate the variants of every image, not only missing or outdated ones.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count(),
+            help="Number of worker processes.",
+        )
+
+    def handle(self, *args, **kwargs):
+        # Products may share an image file, whose variants must be generated only once
+        images = {}
+        for product in (
+            Product.objects.exclude(image="")
+            .exclude(image__isnull=True)
+            .only("pk", "image", "image_variants")
+        ):
+            if kwargs["all"] or needs_image_variants(product):
+                images.setdefault(product.image.name, []).append(product.pk)
+
+        started = time.monotonic()
+        done = 0
+        failed = 0
+        if images:
+            # The workers only touch the storage; they must not inherit open database connections
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=kwargs["workers"], initializer=django.setup
+            ) as executor:
+                futures = {
+                    executor.submit(build_image_variants, name): name for name in images
+                }
+                for future in as_completed(futures):
+                    name = futures[future]
+                    try:
+                        variants = future.result()
+                    except OSError as error:
+                        failed += 1
+                        self.stderr.write(f"{name}: {error}")
+                        continue
+                    Product.objects.filter(pk__in=images[name]).update(
+                        image_variants=variants, updated_at=timezone.now()
+                    )
+                    done += 1
+
+            if done:
+                bump_navigation_version()
+
+        elapsed = time.monotonic() - started
+        rate = len(images) / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated variants for {done} images, {failed} failed, "
+                f"in {elapsed:.2f}s ({rate:.1f} images/sec)."
+            )
+        )
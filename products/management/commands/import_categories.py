@@ -1,22 +1,26 @@
 import csv
+
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.utils.text import slugify
 
-from products.models import ProductCategory
+from products.cache import bump_navigation_version
+from products.models import CategoryGroup, ProductCategory
 
 
 class Command(BaseCommand):
-    help = "Import data from a CSV file into the database"
+    help = "Import categories from a CSV file, creating new ones and updating existing ones"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_file", type=str)
 
     def handle(self, *args, **kwargs):
-        csv_file = kwargs["csv_file"]
-        categories_to_create = []
+        categories = {}
+        # The slug and line each name was last read with, as names are unique too
+        names = {}
+        failed = 0
 
-        with open(csv_file, mode="r", encoding="utf-8") as file:
+        with open(kwargs["csv_file"], mode="r", encoding="utf-8", newline="") as file:
             reader = csv.DictReader(
                 file,
                 quotechar='"',
@@ -24,14 +28,80 @@ class Command(BaseCommand):
                 quoting=csv.QUOTE_ALL,
                 skipinitialspace=True,
             )
-            with transaction.atomic():
-                for row in reader:
-                    category = ProductCategory(
-                        name=row["name"],
-                        description=row["description"],
-                        slug=slugify(row["name"]),
+            # Only the distinct categories are kept, so memory does not grow with the file
+            for row in reader:
+                name = (row.get("name") or "").strip()
+                group_name = (row.get("group_name") or "").strip()
+                if not name or not group_name:
+                    failed += 1
+                    self.stderr.write(
+                        f"Line {reader.line_num}: name and group_name are required."
+                    )
+                    continue
+                slug = (row.get("slug") or "").strip() or slugify(name)
+                other_slug, other_line = names.get(name, (slug, None))
+                if other_slug != slug:
+                    failed += 1
+                    self.stderr.write(
+                        f'Line {reader.line_num}: category "{name}" already has the slug '
+                        f'"{other_slug}" on line {other_line}.'
+                    )
+                    continue
+                if slug in categories:
+                    # A later row may rename the category, freeing its former name
+                    names.pop(categories[slug][0], None)
+                names[name] = (slug, reader.line_num)
+                categories[slug] = (name, row.get("description") or None, group_name)
+
+        # A fixed number of queries whatever the file size: two for the groups, one to
+        # check the names and one upsert for the categories
+        with transaction.atomic():
+            group_names = {group_name for _, _, group_name in categories.values()}
+            CategoryGroup.objects.bulk_create(
+                [CategoryGroup(name=group_name) for group_name in group_names],
+                ignore_conflicts=True,
+            )
+            groups = dict(
+                CategoryGroup.objects.filter(name__in=group_names).values_list(
+                    "name", "pk"
+                )
+            )
+
+            # The upsert matches on slug, so a name already used under another slug would clash
+            existing = dict(
+                ProductCategory.objects.filter(
+                    name__in=[name for name, _, _ in categories.values()]
+                ).values_list("name", "slug")
+            )
+            to_upsert = []
+            for slug, (name, description, group_name) in categories.items():
+                if existing.get(name, slug) != slug:
+                    failed += 1
+                    self.stderr.write(
+                        f'Category "{name}" already exists with the slug "{existing[name]}".'
+                    )
+                    continue
+                to_upsert.append(
+                    ProductCategory(
+                        name=name,
+                        slug=slug,
+                        description=description,
+                        group_id=groups[group_name],
                     )
-                    categories_to_create.append(category)
+                )
 
-                ProductCategory.objects.bulk_create(categories_to_create)
-        self.stdout.write(self.style.SUCCESS("Data imported successfully!"))
+            ProductCategory.objects.bulk_create(
+                to_upsert,
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=["name", "description", "group", "updated_at"],
+            )
+            if to_upsert:
+                transaction.on_commit(bump_navigation_version)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {len(to_upsert)} categories in {len(groups)} groups, "
+                f"{failed} rows failed."
+            )
+        )
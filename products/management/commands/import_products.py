@@ -1,42 +1,206 @@
 import csv
+import time
+from decimal import Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
-from django.db import transaction
-from products.models import Product, ProductCategory
+from django.db import DatabaseError, transaction
 from django.utils.text import slugify
 
+from products.cache import bump_navigation_version
+from products.models import Product, ProductCategory
+
+# Product columns overwritten when an imported row matches an existing slug
+UPDATE_FIELDS = [
+    "name",
+    "description",
+    "price",
+    "discount_price",
+    "image",
+    "image_variants",
+    "ingredients",
+    "updated_at",
+]
+
 
 class Command(BaseCommand):
-    help = "Import products from CSV file"
+    help = "Import products from a CSV file, creating new products and updating existing ones"
 
     def add_arguments(self, parser):
         parser.add_argument("csv_file", type=str)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows written per statement.",
+        )
+        parser.add_argument(
+            "--category-separator",
+            default=";",
+            help="Separator between several names in the category_name column.",
+        )
 
     def handle(self, *args, **kwargs):
-        csv_file = kwargs["csv_file"]
-        products_to_create = []  # Список для массовой загрузки
+        batch_size = kwargs["batch_size"]
+        self.separator = kwargs["category_separator"]
+        self.categories = dict(ProductCategory.objects.values_list("name", "pk"))
+        self.imported = 0
+        self.failed = 0
 
-        with open(csv_file, mode="r", encoding="utf-8") as file:
+        started = time.monotonic()
+        with open(kwargs["csv_file"], mode="r", encoding="utf-8", newline="") as file:
+            # Rows are streamed and written chunk by chunk, so memory use does not grow with the file
             reader = csv.DictReader(file, delimiter=",", quotechar='"')
-            try:
-                with transaction.atomic():  # Открываем транзакцию
-                    for row in reader:
-                        category = ProductCategory.objects.get(
-                            name=row["category_name"]
-                        )
-                        product = Product(
-                            name=row["name"],
-                            description=row["description"],
-                            price=float(row["price"]),  # Проверка на число
-                            image=row["image"],
-                            ingredients=row["ingredients"],
-                            category=category,
-                            slug=slugify(row["name"]),
-                        )
-                        products_to_create.append(product)  # Добавляем в список
-
-                Product.objects.bulk_create(products_to_create)
-
-                self.stdout.write(self.style.SUCCESS("Products imported successfully!"))
-
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"Error importing products: {e}"))
+            chunk = []
+            for row in reader:
+                try:
+                    chunk.append(self.build_row(reader.line_num, row))
+                except ValueError as error:
+                    self.report_error(reader.line_num, error)
+                if len(chunk) >= batch_size:
+                    self.write_chunk(chunk)
+                    chunk = []
+            if chunk:
+                self.write_chunk(chunk)
+
+        if self.imported:
+            bump_navigation_version()
+
+        elapsed = time.monotonic() - started
+        total = self.imported + self.failed
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {self.imported} products, {self.failed} rows failed, "
+                f"in {elapsed:.2f}s ({rate:.0f} rows/sec)."
+            )
+        )
+
+    def build_row(self, line: int, row: dict) -> tuple:
+        """
+        Validates a CSV row and returns (line, product, category ids). Raises `ValueError` if the row is invalid.
+        """
+        name = (row.get("name") or "").strip()
+        if not name:
+            raise ValueError("Product name is empty.")
+
+        category_ids = []
+        for category_name in (row.get("category_name") or "").split(self.separator):
+            category_name = category_name.strip()
+            if not category_name:
+                continue
+            if category_name not in self.categories:
+                raise ValueError(f'Unknown category "{category_name}".')
+            category_ids.append(self.categories[category_name])
+
+        product = Product(
+            name=name,
+            slug=(row.get("slug") or "").strip() or slugify(name),
+            description=row.get("description") or "",
+            price=self.parse_price(row.get("price"), "price"),
+            discount_price=self.parse_price(
+                row.get("discount_price"), "discount_price"
+            ),
+            image=row.get("image") or None,
+            ingredients=row.get("ingredients") or None,
+        )
+        return line, product, category_ids
+
+    def parse_price(self, value: str | None, field_name: str) -> Decimal | None:
+        """
+        Parses a price column, checking it fits the model field. An empty discount price means no discount.
+        """
+        value = (value or "").strip()
+        if not value:
+            if field_name == "discount_price":
+                return None
+            raise ValueError("Price is empty.")
+        try:
+            return Product._meta.get_field(field_name).clean(Decimal(value), None)
+        except (InvalidOperation, ValidationError):
+            raise ValueError(f'Invalid {field_name} "{value}".')
+
+    def write_chunk(self, chunk: list) -> None:
+        """
+        Upserts a chunk of products and replaces their categories, one statement each.
+
+        If the database rejects the chunk, its rows are retried one by one so that only the
+        faulty rows are reported.
+        """
+        # A slug may appear only once per upsert statement; the first row wins
+        rows = {}
+        for line, product, ids in chunk:
+            if product.slug in rows:
+                first_line = rows[product.slug][0]
+                self.report_error(
+                    line, f'Slug "{product.slug}" is already used on line {first_line}.'
+                )
+            else:
+                rows[product.slug] = (line, product, ids)
+        rows = list(rows.values())
+        try:
+            self.save_rows(rows)
+        except DatabaseError:
+            for row in rows:
+                try:
+                    self.save_rows([row])
+                except DatabaseError as error:
+                    self.report_error(row[0], error)
+
+    def save_rows(self, rows: list) -> None:
+        """
+        Writes the products and their category links in a single transaction.
+
+        Updated products keep their image variants only if their image is unchanged.
+        """
+        through = Product.categories.through
+        products = [product for _, product, _ in rows]
+        for product in products:
+            # Forget any key returned by an earlier attempt that was rolled back
+            product.pk = None
+        with transaction.atomic():
+            stored = {
+                slug: (image, variants)
+                for slug, image, variants in Product.objects.filter(
+                    slug__in=[product.slug for product in products]
+                ).values_list("slug", "image", "image_variants")
+            }
+            for product in products:
+                # The variants of a replaced image are regenerated by generate_image_variants
+                image, variants = stored.get(product.slug, (None, {}))
+                same_image = (image or None) == (product.image.name or None)
+                product.image_variants = variants if same_image else {}
+            Product.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=["slug"],
+                update_fields=UPDATE_FIELDS,
+            )
+            if any(product.pk is None for product in products):
+                # The backend did not return the primary keys of the upserted rows
+                pks = dict(
+                    Product.objects.filter(
+                        slug__in=[product.slug for product in products]
+                    ).values_list("slug", "pk")
+                )
+                for product in products:
+                    product.pk = pks[product.slug]
+
+            through.objects.filter(
+                product_id__in=[product.pk for product in products]
+            ).delete()
+            through.objects.bulk_create(
+                [
+                    through(product_id=product.pk, productcategory_id=category_id)
+                    for _, product, category_ids in rows
+                    for category_id in dict.fromkeys(category_ids)
+                ]
+            )
+        self.imported += len(rows)
+
+    def report_error(self, line: int, error: Exception | str) -> None:
+        """
+        Reports a row that could not be imported and carries on with the rest of the file.
+        """
+        self.failed += 1
+        self.stderr.write(f"Line {line}: {error}")
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from products.cache import bump_navigation_version
+from products.models import (
+    CategoryGroup,
+    Product,
+    ProductCategory,
+    SeedData,
+)
+
+DEFAULT_SEED_FILE = Path(settings.BASE_DIR) / "categories-products-data.json"
+
+
+class Command(BaseCommand):
+    help = "Load the catalog seed data, skipping it if the same seed is already loaded"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "seed_file",
+            nargs="?",
+            default=str(DEFAULT_SEED_FILE),
+            help="JSON file with the category groups, categories and products.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Load the seed even if its checksum is already recorded.",
+        )
+
+    def handle(self, *args, **kwargs):
+        started = time.monotonic()
+        path = Path(kwargs["seed_file"])
+        content = path.read_bytes()
+        checksum = hashlib.sha256(content).hexdigest()
+
+        if (
+            not kwargs["force"]
+            and SeedData.objects.filter(name=path.name, checksum=checksum).exists()
+        ):
+            elapsed = (time.monotonic() - started) * 1000
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Seed {path.name} is already loaded, skipped in {elapsed:.0f}ms."
+                )
+            )
+            return
+
+        seed = json.loads(content)
+        with transaction.atomic():
+            self.load_categories(seed)
+            self.load_products(seed)
+            SeedData.objects.update_or_create(
+                name=path.name, defaults={"checksum": checksum}
+            )
+            transaction.on_commit(bump_navigation_version)
+
+        elapsed = (time.monotonic() - started) * 1000
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {len(seed['categories'])} categories and "
+                f"{len(seed['products'])} products from {path.name} in {elapsed:.0f}ms."
+            )
+        )
+
+    def load_categories(self, seed: dict) -> None:
+        """
+        Creates the missing groups and upserts the categories on their name.
+        """
+        CategoryGroup.objects.bulk_create(
+            [CategoryGroup(name=name) for name in seed["groups"]],
+            ignore_conflicts=True,
+        )
+        groups = dict(CategoryGroup.objects.values_list("name", "pk"))
+        ProductCategory.objects.bulk_create(
+            [
+                ProductCategory(
+                    name=category["name"],
+                    slug=category["slug"],
+                    description=category["description"],
+                    group_id=groups[category["group"]],
+                )
+                for category in seed["categories"]
+            ],
+            update_conflicts=True,
+            unique_fields=["name"],
+            update_fields=["slug", "description", "group", "updated_at"],
+        )
+
+    def load_products(self, seed: dict) -> None:
+        """
+        Upserts the products on their slug and replaces their category links.
+        """
+        Product.objects.bulk_create(
+            [
+                Product(
+                    name=product["name"],
+                    slug=product["slug"],
+                    description=product["description"],
+                    price=Decimal(product["price"]),
+                    discount_price=(
+                        Decimal(product["discount_price"])
+                        if product["discount_price"] is not None
+                        else None
+                    ),
+                    image=product["image"],
+                    ingredients=product["ingredients"],
+                )
+                for product in seed["products"]
+            ],
+            update_conflicts=True,
+            unique_fields=["slug"],
+            update_fields=[
+                "name",
+                "description",
+                "price",
+                "discount_price",
+                "image",
+                "ingredients",
+                "updated_at",
+            ],
+        )
+
+        slugs = [product["slug"] for product in seed["products"]]
+        products = dict(
+            Product.objects.filter(slug__in=slugs).values_list("slug", "pk")
+        )
+        categories = dict(ProductCategory.objects.values_list("slug", "pk"))
+        through = Product.categories.through
+        through.objects.filter(product_id__in=products.values()).delete()
+        through.objects.bulk_create(
+            [
+                through(
+                    product_id=products[product["slug"]],
+                    productcategory_id=categories[category_slug],
+                )
+                for product in seed["products"]
+                for category_slug in product["categories"]
+            ]
+        )
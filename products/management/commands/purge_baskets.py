@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from products.cache import invalidate_basket_quantities
+from products.models import Basket
+
+
+class Command(BaseCommand):
+    help = "Delete abandoned basket items older than a given age, in primary key batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Delete basket items created more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rows deleted per statement.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the basket items that would be deleted.",
+        )
+
+    def handle(self, *args, **kwargs):
+        cutoff = timezone.now() - timedelta(days=kwargs["days"])
+        batch_size = kwargs["batch_size"]
+        dry_run = kwargs["dry_run"]
+        stale = Basket.objects.filter(created_timestamp__lt=cutoff).order_by("pk")
+
+        started = time.monotonic()
+        last_pk = 0
+        total = 0
+        while True:
+            # Deleting a slice of pks at a time keeps the row locks short while shoppers use the site
+            batch = list(
+                stale.filter(pk__gt=last_pk).values_list("pk", "user_id")[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_pk = batch[-1][0]
+            total += len(batch)
+            if not dry_run:
+                Basket.objects.filter(pk__in=[pk for pk, _ in batch]).delete()
+                invalidate_basket_quantities(user_pk for _, user_pk in batch)
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        action = "Would delete" if dry_run else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} {total} basket items older than {kwargs['days']} days "
+                f"in {elapsed:.2f}s ({rate:.0f} rows/sec)."
+            )
+        )
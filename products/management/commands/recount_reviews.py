@@ -0,0 +1,89 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from products.cache import bump_navigation_version
+from products.models import Product, Review
+
+
+class Command(BaseCommand):
+    help = "Recompute the review count and latest review date of every product"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of products updated per statement.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the products whose review figures are out of date.",
+        )
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        dry_run = kwargs["dry_run"]
+        reviews = (
+            Review.objects.filter(product=OuterRef("pk")).order_by().values("product")
+        )
+        actual_count = Coalesce(
+            Subquery(reviews.annotate(total=Count("pk")).values("total")), 0
+        )
+        actual_last = Subquery(
+            reviews.annotate(latest=Max("created_at")).values("latest")
+        )
+
+        started = time.monotonic()
+        last_pk = 0
+        total = 0
+        outdated = 0
+        while True:
+            # The review counts are recomputed by correlated subqueries, a page of products at a time
+            batch = list(
+                Product.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .annotate(actual_count=actual_count, actual_last=actual_last)
+                .values_list(
+                    "pk",
+                    "review_count",
+                    "last_reviewed_at",
+                    "actual_count",
+                    "actual_last",
+                )[:batch_size]
+            )
+            if not batch:
+                break
+
+            last_pk = batch[-1][0]
+            total += len(batch)
+            stale = [
+                pk
+                for pk, count, last, real_count, real_last in batch
+                if (count, last) != (real_count, real_last)
+            ]
+            outdated += len(stale)
+            if stale and not dry_run:
+                Product.objects.filter(pk__in=stale).update(
+                    review_count=actual_count,
+                    last_reviewed_at=actual_last,
+                    updated_at=timezone.now(),
+                )
+
+        if outdated and not dry_run:
+            transaction.on_commit(bump_navigation_version)
+
+        elapsed = time.monotonic() - started
+        rate = total / elapsed if elapsed else 0
+        action = "would fix" if dry_run else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {total} products, {action} {outdated} "
+                f"in {elapsed:.2f}s ({rate:.0f} rows/sec)."
+            )
+        )
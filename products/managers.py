@@ -1,24 +1,204 @@
 from decimal import Decimal, ROUND_HALF_UP
 
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import connections, models, transaction
+from django.db.models import Case, Count, F, Q, Sum, Value, When
+from django.db.models.functions import Cast, Round
 from django.utils.timezone import now
 
+# The largest quantity a basket line can hold, the limit of its PositiveSmallIntegerField
+MAX_BASKET_QUANTITY = 32767
+
+BASKET_UPSERT_SQL = """
+    INSERT INTO {table} ({user}, {product}, {quantity}, {created})
+    VALUES (%s, %s, %s, %s)
+    ON CONFLICT ({user}, {product}) DO UPDATE SET {quantity} = CASE
+        WHEN {table}.{quantity} + %s > {max_quantity} THEN {max_quantity}
+        WHEN {table}.{quantity} + %s > 0 THEN {table}.{quantity} + %s
+        ELSE 0
+    END
+    RETURNING {pk}, {quantity}
+"""
+
+BASKET_MERGE_SQL = """
+    INSERT INTO {table} ({user}, {product}, {quantity}, {created})
+    VALUES {values}
+    ON CONFLICT ({user}, {product}) DO UPDATE
+    SET {quantity} = CASE
+        WHEN EXCLUDED.{quantity} > {max_quantity} - {table}.{quantity} THEN {max_quantity}
+        ELSE {table}.{quantity} + EXCLUDED.{quantity}
+    END
+"""
+
+
+def _cents(expression):
+    """Converts a two-decimal money expression into whole cents."""
+    return Cast(Round(expression * Value(100)), models.BigIntegerField())
+
+
+def from_cents(cents) -> Decimal:
+    """Converts a whole number of cents back into a two-decimal Decimal."""
+    return Decimal(cents or 0).scaleb(-2)
+
+
+def _unit_cents(promo_code=None):
+    """Builds the per-unit price in cents, with the promo discount applied if given."""
+    final_cents = _cents(F("product__final_price"))
+    if not promo_code:
+        return final_cents
+
+    # The promo discount only applies to products without a discount price
+    has_discount = Q(product__discount_price__isnull=False) & ~Q(
+        product__discount_price=0
+    )
+    kept_percent = int((1 - Decimal(promo_code.discount)) * 100)
+    promo_cents = (
+        _cents(F("product__price")) * Value(kept_percent) + Value(50)
+    ) / Value(100)
+    return Case(When(has_discount, then=final_cents), default=promo_cents)
+
 
 class BasketQuerySet(models.QuerySet):
     def user_baskets(self, user):
         """Returns baskets filtered by user."""
         return self.filter(user=user)
 
+    def with_line_totals(self, promo_code=None):
+        """
+        Annotates each basket row with `unit_cents` and `line_cents`, computed by the database.
+
+        Mirrors `Basket.sum`: the unit price is the product's `final_price` column, the promo discount
+        applies only to non-discounted products and is rounded HALF_UP to 0.01. Everything is
+        done in integer cents so the result is exact on every backend. Promo code validity is
+        not checked here.
+        """
+        unit_cents = _unit_cents(promo_code)
+        return self.annotate(
+            unit_cents=unit_cents,
+            line_cents=unit_cents * F("quantity"),
+        )
+
+    def with_pricing(self, promo_code=None):
+        """
+        Annotates each basket row with its line totals both without and with the promo code,
+        so a single query is enough to price the whole basket.
+        """
+        queryset = self.with_line_totals()
+        if promo_code:
+            promo_unit_cents = _unit_cents(promo_code)
+            queryset = queryset.annotate(
+                promo_unit_cents=promo_unit_cents,
+                promo_line_cents=promo_unit_cents * F("quantity"),
+            )
+        return queryset
+
+    def add_product(self, user, product_id: int, quantity: int) -> int:
+        """
+        Adds `quantity` (which may be negative) of a product to the user's basket and returns
+        the new quantity of that line.
+
+        The insert-or-increment is a single INSERT ... ON CONFLICT DO UPDATE statement, so
+        concurrent changes to the same line are never lost. The line is deleted once its
+        quantity drops to zero and capped at `MAX_BASKET_QUANTITY`. Raises `IntegrityError`
+        if the product does not exist.
+        """
+        quantity = max(min(quantity, MAX_BASKET_QUANTITY), -MAX_BASKET_QUANTITY)
+        connection = connections[self.db]
+        sql = BASKET_UPSERT_SQL.format(
+            max_quantity=MAX_BASKET_QUANTITY, **self._quoted_names(connection)
+        )
+        params = [user.pk, product_id, max(quantity, 0), now()] + [quantity] * 3
+
+        with transaction.atomic(using=self.db):
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                basket_pk, new_quantity = cursor.fetchone()
+            if new_quantity <= 0:
+                self.filter(pk=basket_pk, quantity__lte=0).delete()
+        return max(new_quantity, 0)
+
+    def merge_quantities(self, user, quantities: dict) -> None:
+        """
+        Adds a {product_id: quantity} mapping of positive quantities to the user's basket.
+
+        Existing lines are incremented and missing ones created, all in a single multi-row
+        INSERT ... ON CONFLICT DO UPDATE statement. Quantities are capped at
+        `MAX_BASKET_QUANTITY`.
+        """
+        if not quantities:
+            return
+
+        connection = connections[self.db]
+        created = now()
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(quantities))
+        sql = BASKET_MERGE_SQL.format(
+            values=values,
+            max_quantity=MAX_BASKET_QUANTITY,
+            **self._quoted_names(connection),
+        )
+        params = []
+        for product_id, quantity in quantities.items():
+            params += [user.pk, product_id, min(quantity, MAX_BASKET_QUANTITY), created]
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def _quoted_names(self, connection) -> dict:
+        """Returns the quoted basket table and column names used by the raw upserts."""
+        opts = self.model._meta
+        quote_name = connection.ops.quote_name
+        return {
+            "table": quote_name(opts.db_table),
+            "pk": quote_name(opts.pk.column),
+            "user": quote_name(opts.get_field("user").column),
+            "product": quote_name(opts.get_field("product").column),
+            "quantity": quote_name(opts.get_field("quantity").column),
+            "created": quote_name(opts.get_field("created_timestamp").column),
+        }
+
+    def set_quantities(self, user, quantities: dict) -> None:
+        """
+        Sets the quantities of several basket lines at once from a {product_id: quantity} mapping.
+
+        Lines with a quantity of zero or less are removed. The whole change runs in a single
+        transaction, with one bulk upsert and one bulk delete. Raises `IntegrityError` if one of
+        the products does not exist.
+        """
+        kept = {pk: quantity for pk, quantity in quantities.items() if quantity > 0}
+        removed = [pk for pk, quantity in quantities.items() if quantity <= 0]
+
+        with transaction.atomic(using=self.db):
+            if kept:
+                self.bulk_create(
+                    [
+                        self.model(user=user, product_id=pk, quantity=quantity)
+                        for pk, quantity in kept.items()
+                    ],
+                    update_conflicts=True,
+                    unique_fields=["user", "product"],
+                    update_fields=["quantity"],
+                )
+            if removed:
+                self.filter(user=user, product_id__in=removed).delete()
+
     def total_sum(self, user, promo_code=None) -> Decimal:
         """Returns the total sum of all items in the user's basket, applying a promo code if valid."""
-        baskets = self.filter(user=user)
-        total = Decimal(sum(basket.sum(promo_code) for basket in baskets))
+        totals = (
+            self.filter(user=user)
+            .with_line_totals(promo_code)
+            .aggregate(total_cents=Sum("line_cents"), lines=Count("pk"))
+        )
+
+        if promo_code and totals["lines"]:
+            if not promo_code.is_valid_for_user(user):
+                raise ValueError("Invalid or expired promo code.")
+
+        total = from_cents(totals["total_cents"])
         return total.quantize(Decimal("0.05"), rounding=ROUND_HALF_UP)
 
     def total_quantity(self, user):
         """Returns the total quantity of all items in the user's basket."""
-        return sum(basket.quantity for basket in self.user_baskets(user))
+        return self.user_baskets(user).aggregate(total=Sum("quantity"))["total"] or 0
 
     def json(self, user, promo_code=None):
         """Returns the user's basket as a JSON-like list."""
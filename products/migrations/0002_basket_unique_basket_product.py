@@ -0,0 +1,41 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:36
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def merge_duplicate_baskets(apps, schema_editor):
+    """
+    Folds duplicate (user, product) basket lines into the oldest one before the
+    unique constraint is added.
+    """
+    Basket = apps.get_model("products", "Basket")
+    duplicates = (
+        Basket.objects.values("user_id", "product_id")
+        .annotate(lines=Count("id"), total=Sum("quantity"))
+        .filter(lines__gt=1)
+    )
+    for duplicate in duplicates:
+        lines = Basket.objects.filter(
+            user_id=duplicate["user_id"], product_id=duplicate["product_id"]
+        ).order_by("created_timestamp", "id")
+        keep = lines.first()
+        lines.exclude(pk=keep.pk).delete()
+        Basket.objects.filter(pk=keep.pk).update(quantity=duplicate["total"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_baskets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='basket',
+            constraint=models.UniqueConstraint(fields=('user', 'product'), name='unique_basket_product'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_basket_unique_basket_product'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='basket',
+            name='created_timestamp',
+            field=models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Created timestamp'),
+        ),
+    ]
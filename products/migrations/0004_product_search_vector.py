@@ -0,0 +1,81 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:42
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+SEARCH_VECTOR_SQL = """
+    setweight(to_tsvector('english', coalesce({row}.name, '')), 'A')
+    || setweight(to_tsvector('english', coalesce({row}.description, '')), 'B')
+    || setweight(to_tsvector('english', coalesce({row}.ingredients, '')), 'C')
+"""
+
+FORWARDS_SQL = [
+    f"""
+    CREATE FUNCTION products_product_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER products_product_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, description, ingredients, search_vector
+    ON products_product
+    FOR EACH ROW EXECUTE FUNCTION products_product_search_vector_update()
+    """,
+    f"""
+    UPDATE products_product
+    SET search_vector = {SEARCH_VECTOR_SQL.format(row="products_product")}
+    """,
+    """
+    CREATE INDEX products_product_search_vector_gin
+    ON products_product USING gin (search_vector)
+    """,
+    """
+    CREATE INDEX products_product_name_trgm
+    ON products_product USING gin (name gin_trgm_ops)
+    """,
+]
+
+BACKWARDS_SQL = [
+    "DROP INDEX IF EXISTS products_product_name_trgm",
+    "DROP INDEX IF EXISTS products_product_search_vector_gin",
+    "DROP TRIGGER IF EXISTS products_product_search_vector_trigger ON products_product",
+    "DROP FUNCTION IF EXISTS products_product_search_vector_update()",
+]
+
+
+def run_on_postgresql(statements):
+    """
+    Returns a RunPython callable that executes the statements on PostgreSQL only,
+    so the migration stays a no-op on SQLite.
+    """
+
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_basket_created_timestamp_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='product',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True, verbose_name='Search vector'),
+        ),
+        migrations.RunPython(
+            run_on_postgresql(FORWARDS_SQL), run_on_postgresql(BACKWARDS_SQL)
+        ),
+    ]
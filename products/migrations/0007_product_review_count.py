@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-18 14:30
+
+from django.db import migrations, models
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_reviews(apps, schema_editor):
+    """
+    Fills the review count and the latest review date of every product in one statement.
+    """
+    Product = apps.get_model("products", "Product")
+    Review = apps.get_model("products", "Review")
+    reviews = Review.objects.filter(product=OuterRef("pk")).order_by().values("product")
+    Product.objects.update(
+        review_count=Coalesce(
+            Subquery(reviews.annotate(total=Count("pk")).values("total")), 0
+        ),
+        last_reviewed_at=Subquery(
+            reviews.annotate(latest=Max("created_at")).values("latest")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0006_product_final_price'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='last_reviewed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Last reviewed at'),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Review count'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['review_count', 'id'], name='product_review_count_id_idx'),
+        ),
+        migrations.RunPython(count_reviews, migrations.RunPython.noop),
+    ]
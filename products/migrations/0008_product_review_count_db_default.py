@@ -0,0 +1,18 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0007_product_review_count'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(db_default=0, default=0, editable=False, verbose_name='Review count'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0008_product_review_count_db_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SeedData',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=128, unique=True, verbose_name='Seed name')),
+                ('checksum', models.CharField(max_length=64, verbose_name='SHA-256 checksum')),
+                ('loaded_at', models.DateTimeField(auto_now=True, verbose_name='Loaded at')),
+            ],
+            options={
+                'verbose_name': 'seed data',
+                'verbose_name_plural': 'seed data',
+            },
+        ),
+    ]
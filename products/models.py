@@ -1,3 +1,4 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.text import slugify
 from decimal import Decimal, ROUND_HALF_UP
@@ -33,6 +34,7 @@ class ProductCategory(models.Model):
     group = models.ForeignKey(
         CategoryGroup, on_delete=models.CASCADE, related_name="categories"
     )
+    updated_at = models.DateTimeField("Updated at", auto_now=True)
 
     class Meta:
         verbose_name = "category"
@@ -75,16 +77,45 @@ class Product(models.Model):
         "Product image", upload_to="products_images", null=True, blank=True
     )
     ingredients = models.TextField("Product ingredients", null=True, blank=True)
+    # Resized WebP/AVIF copies of the image, see products.images
+    image_variants = models.JSONField(
+        "Image variants", default=dict, blank=True, editable=False
+    )
     categories = models.ManyToManyField(
         ProductCategory,
         verbose_name="Product categories",
         blank=True,
         related_name="products",
     )
+    # The price the customer pays, computed by the database so it can be filtered, sorted and indexed
+    final_price = models.GeneratedField(
+        expression=models.Case(
+            models.When(
+                models.Q(discount_price__isnull=False) & ~models.Q(discount_price=0),
+                then=models.F("discount_price"),
+            ),
+            default=models.F("price"),
+        ),
+        output_field=models.DecimalField(max_digits=4, decimal_places=2),
+        db_persist=True,
+        verbose_name="Final price",
+    )
+    # Maintained by the review views, see also the recount_reviews command
+    review_count = models.PositiveIntegerField(
+        "Review count", default=0, db_default=0, editable=False
+    )
+    last_reviewed_at = models.DateTimeField(
+        "Last reviewed at", null=True, blank=True, editable=False
+    )
+    # Also set by every bulk write, as it validates the cached copies of the product page
+    updated_at = models.DateTimeField("Updated at", auto_now=True)
+    # Kept up to date by a database trigger on PostgreSQL, see products.search
+    search_vector = SearchVectorField("Search vector", null=True, editable=False)
 
     def get_final_price(self) -> Decimal:
         """
         Returns the final price of the product, considering any discount.
+        Mirrors the `final_price` column, which is only available once the product is saved.
         """
         return self.discount_price if self.discount_price else self.price
 
@@ -92,6 +123,15 @@ class Product(models.Model):
         verbose_name = "product"
         verbose_name_plural = "products"
         ordering = ["name"]
+        indexes = [
+            models.Index(fields=["name", "id"], name="product_name_id_idx"),
+            models.Index(
+                fields=["final_price", "id"], name="product_final_price_id_idx"
+            ),
+            models.Index(
+                fields=["review_count", "id"], name="product_review_count_id_idx"
+            ),
+        ]
 
     def save(self, *args, **kwargs) -> None:
         """
@@ -124,7 +164,9 @@ class Basket(models.Model):
         related_name="baskets",
     )
     quantity = models.PositiveSmallIntegerField("Quantity", default=0)
-    created_timestamp = models.DateTimeField("Created timestamp", auto_now_add=True)
+    created_timestamp = models.DateTimeField(
+        "Created timestamp", auto_now_add=True, db_index=True
+    )
 
     objects = BasketQuerySet.as_manager()
 
@@ -132,6 +174,11 @@ class Basket(models.Model):
         verbose_name = "basket"
         verbose_name_plural = "baskets"
         ordering = ["-created_timestamp"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "product"], name="unique_basket_product"
+            )
+        ]
 
     def __str__(self) -> str:
         """
@@ -198,3 +245,24 @@ class Review(models.Model):
         Returns a string representing the review by the user for the product.
         """
         return f"Review by {self.user} for {self.product}"
+
+
+class SeedData(models.Model):
+    """
+    Records the checksum of a seed file loaded by the `load_seed_data` command,
+    so that an unchanged seed is not loaded again.
+    """
+
+    name = models.CharField("Seed name", max_length=128, unique=True)
+    checksum = models.CharField("SHA-256 checksum", max_length=64)
+    loaded_at = models.DateTimeField("Loaded at", auto_now=True)
+
+    class Meta:
+        verbose_name = "seed data"
+        verbose_name_plural = "seed data"
+
+    def __str__(self) -> str:
+        """
+        Returns the seed name with its checksum.
+        """
+        return f"{self.name} ({self.checksum[:12]})"
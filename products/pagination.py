@@ -0,0 +1,115 @@
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+
+class KeysetPage:
+    """
+    A page of products taken after or before a cursor, in (name, id), (sort column, id) or
+    (search rank, id) order.
+
+    Unlike Django's `Paginator`, it never counts the rows or uses OFFSET, so every page costs
+    the same single query no matter how deep it is.
+    """
+
+    def __init__(
+        self, object_list: list, next_cursor: str | None, previous_cursor: str | None
+    ) -> None:
+        """
+        Stores the page's objects and the cursors of the neighbouring pages.
+        """
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def encode_cursor(direction: str, product, field: str = "name") -> str:
+    """
+    Returns an opaque cursor pointing after (or before) the given product in `field` order.
+    """
+    payload = json.dumps([direction, str(getattr(product, field)), product.pk]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str, int]:
+    """
+    Decodes a cursor into its direction, sort value and id. Raises `ValueError` if it is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        direction, value, pk = json.loads(base64.urlsafe_b64decode(padded))
+    except (TypeError, ValueError) as error:
+        raise ValueError("Invalid cursor.") from error
+    if direction not in (NEXT, PREVIOUS) or not isinstance(pk, int):
+        raise ValueError("Invalid cursor.")
+    return direction, str(value), pk
+
+
+def paginate_keyset(
+    queryset: QuerySet, cursor: str | None, page_size: int, ordering: str = "name"
+) -> KeysetPage:
+    """
+    Returns the page of the queryset that follows the cursor, ordered by (`ordering`, id).
+
+    `ordering` is a non-null field or annotation name, prefixed with "-" for descending order;
+    the id breaks ties in the same direction. A missing or malformed cursor gives the first page.
+    """
+    field = ordering.lstrip("-")
+    direction, value, pk = NEXT, None, None
+    if cursor:
+        try:
+            direction, value, pk = decode_cursor(cursor)
+            if field in queryset.query.annotations:
+                output_field = queryset.query.annotations[field].output_field
+            else:
+                model_field = queryset.model._meta.get_field(field)
+                # Generated columns such as `final_price` convert through their output field
+                output_field = getattr(model_field, "output_field", model_field)
+            value = output_field.to_python(value)
+        except (ValueError, ValidationError):
+            # Malformed, or made for another ordering
+            direction, value, pk = NEXT, None, None
+
+    # Walking backwards through a descending list is an ascending scan, and vice versa
+    if (direction == NEXT) != ordering.startswith("-"):
+        queryset = queryset.order_by(field, "id")
+        after = Q(**{f"{field}__gt": value}) | Q(**{field: value, "id__gt": pk})
+    else:
+        queryset = queryset.order_by(f"-{field}", "-id")
+        after = Q(**{f"{field}__lt": value}) | Q(**{field: value, "id__lt": pk})
+    if pk is not None:
+        queryset = queryset.filter(after)
+
+    rows = list(queryset[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == PREVIOUS:
+        rows.reverse()
+
+    has_next = has_more if direction == NEXT else True
+    has_previous = pk is not None if direction == NEXT else has_more
+    return KeysetPage(
+        rows,
+        encode_cursor(NEXT, rows[-1], field) if rows and has_next else None,
+        encode_cursor(PREVIOUS, rows[0], field) if rows and has_previous else None,
+    )
@@ -0,0 +1,144 @@
+from decimal import Decimal
+
+from django.http import HttpRequest
+
+from products.guest_basket import GuestBasket
+from products.managers import from_cents
+from products.models import Basket
+
+
+class BasketPricing:
+    """
+    The priced contents of a user's basket.
+
+    Holds the basket lines (with their products loaded), the total before and after the promo
+    code and the discount applied. Everything is computed from a single basket query.
+    """
+
+    def __init__(self, lines: list, promo_code=None) -> None:
+        """
+        Builds the totals from basket lines annotated by `BasketQuerySet.with_pricing`.
+        """
+        self.lines = lines
+        self.promo_code = promo_code
+        self.total_sum = from_cents(sum(line.line_cents for line in lines))
+        self.total_after_promo = None
+        if promo_code is not None:
+            self.total_after_promo = from_cents(
+                sum(line.promo_line_cents for line in lines)
+            )
+
+    @classmethod
+    def for_user(cls, user, promo_code=None) -> "BasketPricing":
+        """
+        Prices the user's basket, raising `ValueError` if the promo code is not valid for them.
+        """
+        if not user.is_authenticated:
+            return cls([])
+
+        lines = list(
+            Basket.objects.user_baskets(user)
+            .select_related("product")
+            .with_pricing(promo_code)
+        )
+        if promo_code is not None and lines:
+            if not promo_code.is_valid_for_user(user):
+                raise ValueError("Invalid or expired promo code.")
+        return cls(lines, promo_code)
+
+    @classmethod
+    def for_guest(cls, guest_basket: GuestBasket) -> "BasketPricing":
+        """
+        Prices a guest basket. Its lines are not stored, so they are priced one by one with
+        `Basket.sum`; guest baskets are small and promo codes do not apply to them.
+        """
+        lines = guest_basket.baskets()
+        for line in lines:
+            line.line_cents = int(line.sum().scaleb(2))
+        return cls(lines)
+
+    @property
+    def total_quantity(self) -> int:
+        """
+        Returns the number of items in the basket.
+        """
+        return sum(line.quantity for line in self.lines)
+
+    @property
+    def discount(self) -> Decimal:
+        """
+        Returns the amount taken off the basket total by the promo code.
+        """
+        if self.total_after_promo is None:
+            return from_cents(0)
+        return self.total_sum - self.total_after_promo
+
+    @property
+    def total(self) -> Decimal:
+        """
+        Returns the amount the user has to pay.
+        """
+        if self.total_after_promo is None:
+            return self.total_sum
+        return self.total_after_promo
+
+    def totals_json(self) -> dict:
+        """
+        Returns the basket totals and item count as a JSON-compatible dictionary.
+        """
+        return {
+            "basket_total_sum": str(self.total_sum),
+            "total_after_promo": (
+                str(self.total_after_promo)
+                if self.total_after_promo is not None
+                else None
+            ),
+            "total_quantity": self.total_quantity,
+        }
+
+    def json(self) -> list[dict]:
+        """
+        Returns the basket lines as JSON-compatible dictionaries, in the `Basket.de_json` format.
+        """
+        return [
+            {
+                "product_name": line.product.name,
+                "quantity": line.quantity,
+                "price": str(line.product.final_price),
+                "sum": str(self.line_total(line)),
+            }
+            for line in self.lines
+        ]
+
+    def line_total(self, line) -> Decimal:
+        """
+        Returns the total of a single line, with the promo code applied if there is one.
+        """
+        if self.promo_code is None:
+            return from_cents(line.line_cents)
+        return from_cents(line.promo_line_cents)
+
+
+def get_basket_pricing(request: HttpRequest, promo_code=None) -> BasketPricing:
+    """
+    Returns the pricing of the current user's basket, or of the visitor's guest basket,
+    computed at most once per request.
+    """
+    cache = getattr(request, "_basket_pricing", None)
+    if cache is None:
+        cache = request._basket_pricing = {}
+
+    key = promo_code.pk if promo_code is not None else None
+    if key not in cache:
+        if request.user.is_authenticated:
+            cache[key] = BasketPricing.for_user(request.user, promo_code)
+        else:
+            cache[key] = BasketPricing.for_guest(GuestBasket.from_request(request))
+    return cache[key]
+
+
+def clear_basket_pricing(request: HttpRequest) -> None:
+    """
+    Drops the memoized basket pricing after the basket has been changed.
+    """
+    request._basket_pricing = {}
@@ -0,0 +1,135 @@
+import re
+from bisect import bisect_left
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, F, FloatField, Q, QuerySet, Value, When
+from django.db.models.functions import Cast
+
+from products.cache import get_search_version
+from products.models import Product
+
+# Relative weight of a match in each product field, as in the PostgreSQL search vector (A, B, C)
+FIELD_WEIGHTS = {"name": 1.0, "description": 0.4, "ingredients": 0.2}
+
+_TOKEN_RE = re.compile(r"\w+")
+_index = None
+
+
+def tokenize(text: str | None) -> list[str]:
+    """
+    Splits text into lowercase word tokens.
+    """
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def search_products(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filters the products matching the search query, annotates them with their `rank` and orders
+    them by (rank, id), both descending, so that they can be paged with a keyset cursor.
+
+    Every query word must match the start of a word in the product's name, description or
+    ingredients. On PostgreSQL this runs against the trigger-maintained `search_vector` column
+    and its GIN index, with trigram similarity on the name to tolerate typos. Other databases
+    use an in-memory inverted index instead.
+    """
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset
+    if connection.vendor == "postgresql":
+        return _search_postgresql(queryset, query, tokens)
+    return _search_index(queryset, tokens)
+
+
+def _search_postgresql(queryset: QuerySet, query: str, tokens: list[str]) -> QuerySet:
+    """Full-text search with prefix matching, falling back to trigram similarity on the name."""
+    search_query = SearchQuery(
+        " & ".join(f"{token}:*" for token in tokens),
+        config="english",
+        search_type="raw",
+    )
+    return (
+        queryset.filter(Q(search_vector=search_query) | Q(name__trigram_similar=query))
+        .annotate(
+            # The scaled similarity orders the typo matches, which match no word and rank 0
+            rank=Cast(
+                SearchRank(F("search_vector"), search_query)
+                + TrigramSimilarity("name", query) / 1000,
+                FloatField(),
+            )
+        )
+        .order_by("-rank", "-id")
+    )
+
+
+def _search_index(queryset: QuerySet, tokens: list[str]) -> QuerySet:
+    """Search through the in-memory inverted index, annotating the queryset with the computed rank."""
+    ranks = get_search_index().search(tokens)
+    if not ranks:
+        return queryset.none()
+
+    rank = Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in ranks.items()],
+        output_field=FloatField(),
+    )
+    return queryset.filter(pk__in=ranks).annotate(rank=rank).order_by("-rank", "-id")
+
+
+class SearchIndex:
+    """
+    A pure-Python inverted index over product names, descriptions and ingredients.
+
+    Maps every token to the products containing it, with the weight of the best field it appears in.
+    Tokens are kept sorted so that prefixes can be looked up with a binary search.
+    """
+
+    def __init__(self, products) -> None:
+        """
+        Indexes the given products.
+        """
+        self.postings = {}
+        for product in products:
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(getattr(product, field)):
+                    posting = self.postings.setdefault(token, {})
+                    posting[product.pk] = max(posting.get(product.pk, 0), weight)
+        self.tokens = sorted(self.postings)
+
+    def prefix_matches(self, prefix: str) -> dict:
+        """
+        Returns the best weight per product over all tokens starting with the prefix.
+        """
+        matches = {}
+        position = bisect_left(self.tokens, prefix)
+        while position < len(self.tokens) and self.tokens[position].startswith(prefix):
+            for pk, weight in self.postings[self.tokens[position]].items():
+                matches[pk] = max(matches.get(pk, 0), weight)
+            position += 1
+        return matches
+
+    def search(self, tokens: list[str]) -> dict:
+        """
+        Returns {product_pk: rank} for the products matching every token.
+        """
+        ranks = None
+        for token in tokens:
+            matches = self.prefix_matches(token)
+            if ranks is None:
+                ranks = matches
+            else:
+                ranks = {pk: ranks[pk] + matches[pk] for pk in ranks if pk in matches}
+            if not ranks:
+                return {}
+        return ranks
+
+
+def get_search_index() -> SearchIndex:
+    """
+    Returns the in-memory search index, rebuilt in this process when the searched texts change.
+    """
+    global _index
+    version = get_search_version()
+    if _index is None or _index[0] != version:
+        products = Product.objects.only("pk", *FIELD_WEIGHTS).iterator(chunk_size=2000)
+        _index = (version, SearchIndex(products))
+    return _index[1]
@@ -0,0 +1,191 @@
+import threading
+
+from django.contrib.auth.signals import user_logged_in
+from django.db import connection, transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from django.utils import timezone
+
+from products.cache import (
+    bump_catalog_version,
+    bump_category_versions,
+    bump_navigation_version,
+    bump_search_version,
+    invalidate_basket_quantity,
+)
+from products.guest_basket import merge_guest_basket
+from products.images import build_image_variants, needs_image_variants
+from products.models import CategoryGroup, Product, ProductCategory
+
+# Product fields held by the search and autocomplete indexes, see products.search
+SEARCHED_FIELDS = ("name", "slug", "description", "ingredients")
+
+
+@receiver(user_logged_in)
+def merge_guest_basket_on_login(sender, request, user, **kwargs) -> None:
+    """
+    Moves the visitor's guest basket into their database basket when they sign in.
+    """
+    if request is None:
+        return
+    merge_guest_basket(request, user)
+    invalidate_basket_quantity(user.pk)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(m2m_changed, sender=Product.categories.through)
+def invalidate_catalog(sender, **kwargs) -> None:
+    """
+    Moves the catalog to a new version whenever products or their categories change.
+
+    The bump waits for the transaction to commit, so a concurrent request cannot cache the old
+    data under the new version.
+    """
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(pre_save, sender=Product)
+def detect_searched_text_change(sender, instance, **kwargs) -> None:
+    """
+    Notes whether a saved product's searched texts differ from the stored ones, so that price
+    or stock edits leave the search indexes alone.
+    """
+    stored = (
+        Product.objects.filter(pk=instance.pk).values(*SEARCHED_FIELDS).first()
+        if instance.pk is not None
+        else None
+    )
+    instance._searched_text_changed = stored is None or any(
+        stored[field] != getattr(instance, field) for field in SEARCHED_FIELDS
+    )
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_search_indexes(sender, instance, **kwargs) -> None:
+    """
+    Moves the searched texts to a new version when a product was added, deleted or renamed.
+    """
+    if getattr(instance, "_searched_text_changed", True):
+        transaction.on_commit(bump_search_version)
+
+
+@receiver(post_save, sender=Product)
+@receiver(pre_delete, sender=Product)
+def invalidate_product_categories(sender, instance, **kwargs) -> None:
+    """
+    Purges the cached pages of the categories listing a product that was edited or deleted.
+    """
+    pks = list(instance.categories.values_list("pk", flat=True))
+    if pks:
+        transaction.on_commit(lambda: bump_category_versions(pks))
+
+
+@receiver(m2m_changed, sender=Product.categories.through)
+def invalidate_changed_categories(
+    sender, instance, action, reverse, pk_set, **kwargs
+) -> None:
+    """
+    Purges the cached pages of every category listing a product whose categories changed.
+
+    Besides the categories added or removed, the other categories of the product are purged
+    too, as their type facets count its categories. Cleared categories are read before the
+    clear, while they are still linked.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if reverse:
+        # The change was made from the category side, so `instance` is the category
+        if action == "pre_clear":
+            product_pks = list(instance.products.values_list("pk", flat=True))
+        else:
+            product_pks = pk_set
+        pks = {instance.pk, *_product_category_pks(product_pks)}
+    else:
+        pks = {*_product_category_pks([instance.pk]), *(pk_set or ())}
+    if pks:
+        transaction.on_commit(lambda: bump_category_versions(pks))
+
+
+def _product_category_pks(product_pks) -> list[int]:
+    """Returns the primary keys of the categories the given products belong to."""
+    return list(
+        Product.categories.through.objects.filter(product_id__in=product_pks)
+        .values_list("productcategory_id", flat=True)
+        .distinct()
+    )
+
+
+@receiver(post_save, sender=ProductCategory)
+@receiver(post_delete, sender=ProductCategory)
+@receiver(post_save, sender=CategoryGroup)
+@receiver(post_delete, sender=CategoryGroup)
+def invalidate_navigation(sender, **kwargs) -> None:
+    """
+    Moves the navigation and the catalog to a new version whenever categories or groups change.
+    """
+    transaction.on_commit(bump_navigation_version)
+
+
+@receiver(post_save, sender=Product)
+def update_image_variants(sender, instance, **kwargs) -> None:
+    """
+    Regenerates the resized copies of a product image in the background when the image has
+    been replaced, so that saving a product in the admin does not wait for the encoders.
+
+    Stale variants are dropped at once, and the original is served until the new ones are
+    written; the `generate_image_variants` command reports unreadable images.
+    """
+    if needs_image_variants(instance):
+        image_name = instance.image.name
+        transaction.on_commit(
+            lambda: threading.Thread(
+                target=_build_image_variants_in_background,
+                args=(instance.pk, image_name),
+                daemon=True,
+            ).start()
+        )
+    elif instance.image or not instance.image_variants:
+        return
+    if instance.image_variants:
+        instance.image_variants = {}
+        instance.updated_at = timezone.now()
+        Product.objects.filter(pk=instance.pk).update(
+            image_variants={}, updated_at=instance.updated_at
+        )
+
+
+def _build_image_variants_in_background(product_pk: int, image_name: str) -> None:
+    """Runs `rebuild_image_variants` in its own thread, whose connection is closed afterwards."""
+    try:
+        rebuild_image_variants(product_pk, image_name)
+    finally:
+        connection.close()
+
+
+def rebuild_image_variants(product_pk: int, image_name: str) -> None:
+    """
+    Builds the variants of a product image and stores them if the product still shows it.
+    """
+    try:
+        variants = build_image_variants(image_name)
+    except OSError:
+        return
+    updated = Product.objects.filter(pk=product_pk, image=image_name).update(
+        image_variants=variants, updated_at=timezone.now()
+    )
+    if updated:
+        # The product cards follow `updated_at`, the cached pages their versions
+        bump_catalog_version()
+        bump_category_versions(
+            Product.categories.through.objects.filter(
+                product_id=product_pk
+            ).values_list("productcategory_id", flat=True)
+        )
@@ -1,9 +1,32 @@
 from django import template
+
+from products.cache import get_navigation_version
 from products.models import ProductCategory
 
 register = template.Library()
 
+_categories = None
+
 
 @register.simple_tag
 def get_categories():
-    return ProductCategory.objects.filter(group__name="Format").all()
+    """
+    Returns the "Format" categories shown in the navigation menu.
+
+    The list is kept in this process and reloaded only when the navigation version changes,
+    so rendering the menu costs no query.
+    """
+    global _categories
+    version = get_navigation_version()
+    if _categories is None or _categories[0] != version:
+        categories = list(ProductCategory.objects.filter(group__name="Format"))
+        _categories = (version, categories)
+    return _categories[1]
+
+
+@register.simple_tag(name="get_navigation_version")
+def navigation_version():
+    """
+    Returns the current navigation version, to key template fragments showing the categories.
+    """
+    return get_navigation_version()
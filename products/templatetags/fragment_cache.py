@@ -0,0 +1,61 @@
+from django import template
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+
+from products.cache import FRAGMENT_NAMES, FRAGMENT_TIMEOUT, count_fragment_lookup
+
+register = template.Library()
+
+# Rendered instead of the CSRF token, which differs per visitor, and replaced on every render
+CSRF_TOKEN_PLACEHOLDER = "__csrf_token__"
+
+
+class FragmentCacheNode(template.Node):
+    def __init__(self, nodelist, fragment_name: str, vary_on: list):
+        self.nodelist = nodelist
+        self.fragment_name = fragment_name
+        self.vary_on = vary_on
+
+    def render(self, context) -> str:
+        """
+        Returns the cached fragment with the visitor's CSRF token, rendering it on a miss.
+        """
+        vary_on = [var.resolve(context) for var in self.vary_on]
+        key = make_template_fragment_key(self.fragment_name, vary_on)
+        value = cache.get(key)
+        count_fragment_lookup(self.fragment_name, hit=value is not None)
+        if value is None:
+            with context.push(csrf_token=CSRF_TOKEN_PLACEHOLDER):
+                value = self.nodelist.render(context)
+            cache.set(key, value, FRAGMENT_TIMEOUT)
+        return value.replace(CSRF_TOKEN_PLACEHOLDER, str(context.get("csrf_token", "")))
+
+
+@register.tag
+def fragment_cache(parser, token):
+    """
+    Caches a template fragment shared by every visitor, like Django's `{% cache %}` tag:
+
+        {% fragment_cache "product_card" product.pk product.updated_at %}
+            ...
+        {% endfragment_cache %}
+
+    The fragment is keyed by its name and the values that follow, which should include the
+    version of the data it shows. It may contain `{% csrf_token %}`, which is filled in per
+    visitor. Hits and misses are counted per name for the `catalog_cache_stats` command.
+    """
+    bits = token.split_contents()
+    if len(bits) < 2:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' tag requires at least one argument."
+        )
+    fragment_name = bits[1].strip("\"'")
+    if fragment_name not in FRAGMENT_NAMES:
+        raise template.TemplateSyntaxError(
+            f"Unknown fragment '{fragment_name}', add it to FRAGMENT_NAMES."
+        )
+    nodelist = parser.parse(("endfragment_cache",))
+    parser.delete_first_token()
+    return FragmentCacheNode(
+        nodelist, fragment_name, [parser.compile_filter(bit) for bit in bits[2:]]
+    )
@@ -0,0 +1,43 @@
+from django import template
+from django.core.files.storage import default_storage
+
+register = template.Library()
+
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp"}
+
+
+@register.inclusion_tag("partial/product_picture.html")
+def product_picture(product, sizes: str, css_class: str = "", lazy: bool = True):
+    """
+    Renders a product image as a <picture> with a `srcset` per variant format.
+
+    The original image stays the fallback `src`, and the explicit width and height let the
+    browser reserve the space before the image arrives. Until then the blurred placeholder
+    and the dominant color stored with the variants are shown inline, with no extra request.
+    Variants made from another image than the current one are ignored, so a replaced image is
+    served alone until its own variants are built.
+    """
+    variants = product.image_variants
+    if variants.get("source") != product.image.name:
+        variants = {}
+    sources = [
+        {
+            "type": MIME_TYPES[fmt],
+            "srcset": ", ".join(
+                f"{default_storage.url(name)} {width}w" for name, width, _ in files
+            ),
+        }
+        for fmt, files in variants.get("formats", {}).items()
+        if files
+    ]
+    return {
+        "product": product,
+        "sources": sources,
+        "sizes": sizes,
+        "width": variants.get("width"),
+        "height": variants.get("height"),
+        "placeholder": variants.get("placeholder"),
+        "color": variants.get("color"),
+        "css_class": css_class,
+        "lazy": lazy,
+    }
@@ -1 +1,1427 @@
-# Create your tests here.
+import csv
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from io import BytesIO, StringIO
+from types import SimpleNamespace
+from decimal import Decimal, ROUND_HALF_UP
+from unittest import mock, skipUnless
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.template.loader import render_to_string
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
+
+from accounts.models import PromoCode, User
+from products.cache import (
+    flush_fragment_stats,
+    get_fragment_cache_stats,
+    reset_fragment_cache_stats,
+)
+from products.autocomplete import PrefixIndex
+from products.checks import check_shared_cache
+from products.guest_basket import GuestBasket
+from products.images import needs_image_variants
+from products.managers import MAX_BASKET_QUANTITY, from_cents
+from products.models import (
+    Basket,
+    CategoryGroup,
+    Product,
+    ProductCategory,
+    Review,
+    SeedData,
+)
+from products.pricing import BasketPricing
+from products.signals import (
+    _build_image_variants_in_background,
+    rebuild_image_variants,
+)
+from products.templatetags.product_images import product_picture
+from products.search import (
+    FIELD_WEIGHTS,
+    SearchIndex,
+    get_search_index,
+    search_products,
+    tokenize,
+)
+
+
+# Words the benchmark catalogs are generated from
+BENCHMARK_WORDS = (
+    "milk dark white hazelnut almond caramel praline truffle mint orange "
+    "salt bar box cocoa vanilla raspberry coffee chili ginger honey"
+).split()
+
+
+def percentile(timings: list[float], percent: int) -> float:
+    """
+    Returns the timing below which the given percentage of the timings fall.
+    """
+    return sorted(timings)[len(timings) * percent // 100]
+
+
+class BasketPricingTests(TestCase):
+    """
+    Checks the database-computed basket totals against the per-line `Basket.sum` computation.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        cls.promo_code = PromoCode.objects.create(
+            code="SWEET15",
+            discount=Decimal("0.15"),
+            valid_from=timezone.now() - timedelta(days=1),
+            valid_to=timezone.now() + timedelta(days=1),
+        )
+        # Regular, discounted, zero discount and NULL discount prices, with odd cents so the
+        # promo discount has to be rounded
+        cls.products = [
+            Product.objects.create(
+                name=name,
+                slug=name.lower().replace(" ", "-"),
+                description="Cocoa",
+                price=Decimal(price),
+                discount_price=Decimal(discount) if discount is not None else None,
+            )
+            for name, price, discount in [
+                ("Dark Bar", "3.33", None),
+                ("Milk Bar", "7.99", "5.49"),
+                ("White Bar", "4.15", "0"),
+                ("Praline Box", "12.07", None),
+                ("Truffle Egg", "9.95", "9.95"),
+            ]
+        ]
+
+    def add_lines(self, quantities):
+        for product, quantity in zip(self.products, quantities):
+            Basket.objects.create(user=self.user, product=product, quantity=quantity)
+
+    def old_total_sum(self, promo_code=None) -> Decimal:
+        """The total as computed before, one `Basket.sum` call per line."""
+        total = Decimal(
+            sum(
+                basket.sum(promo_code)
+                for basket in Basket.objects.filter(user=self.user)
+            )
+        )
+        return total.quantize(Decimal("0.05"), rounding=ROUND_HALF_UP)
+
+    def test_total_sum_matches_per_line_sum(self):
+        self.add_lines([1, 3, 2, 7, 5])
+        self.assertEqual(Basket.objects.total_sum(self.user), self.old_total_sum())
+
+    def test_total_sum_with_promo_code_matches_per_line_sum(self):
+        self.add_lines([1, 3, 2, 7, 5])
+        self.assertEqual(
+            Basket.objects.total_sum(self.user, self.promo_code),
+            self.old_total_sum(self.promo_code),
+        )
+
+    def test_line_totals_match_per_line_sum(self):
+        self.add_lines([2, 1, 4, 3, 1])
+        for promo_code in (None, self.promo_code):
+            lines = Basket.objects.filter(user=self.user).with_pricing(promo_code)
+            for line in lines:
+                cents = line.promo_line_cents if promo_code else line.line_cents
+                self.assertEqual(from_cents(cents), line.sum(promo_code), line.product)
+
+    def test_discount_price_wins_and_zero_discount_is_ignored(self):
+        self.add_lines([0, 2, 3])
+        lines = {
+            line.product_id: line
+            for line in Basket.objects.filter(user=self.user).with_pricing(
+                self.promo_code
+            )
+        }
+        milk_bar, white_bar = self.products[1], self.products[2]
+        # The discount price is kept and the promo code does not apply on top of it
+        self.assertEqual(
+            from_cents(lines[milk_bar.pk].promo_line_cents), Decimal("10.98")
+        )
+        # A zero discount price counts as no discount, so the promo code applies
+        self.assertEqual(from_cents(lines[white_bar.pk].line_cents), Decimal("12.45"))
+        self.assertEqual(
+            from_cents(lines[white_bar.pk].promo_line_cents), Decimal("10.59")
+        )
+
+    def test_basket_pricing_matches_per_line_sum(self):
+        self.add_lines([1, 3, 2, 7, 5])
+        pricing = BasketPricing.for_user(self.user, self.promo_code)
+        self.assertEqual(pricing.total_sum, self.old_total_sum())
+        self.assertEqual(pricing.total_after_promo, self.old_total_sum(self.promo_code))
+        self.assertEqual(
+            pricing.discount, pricing.total_sum - pricing.total_after_promo
+        )
+        self.assertEqual(pricing.total_quantity, 18)
+
+    def test_empty_basket(self):
+        self.assertEqual(Basket.objects.total_sum(self.user), Decimal("0.00"))
+        self.assertEqual(
+            Basket.objects.total_sum(self.user, self.promo_code), Decimal("0.00")
+        )
+        pricing = BasketPricing.for_user(self.user, self.promo_code)
+        self.assertEqual(pricing.lines, [])
+        self.assertEqual(pricing.total, Decimal("0.00"))
+
+
+class BasketAddTests(TestCase):
+    """
+    Checks that adding a product to the basket upserts a single line.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        cls.product = Product.objects.create(
+            name="Dark Bar", slug="dark-bar", description="Cocoa", price=Decimal("3.50")
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def add(self, quantity):
+        return self.client.post(
+            reverse("add_to_card"),
+            {"product_pk": self.product.pk, "quantity": quantity},
+            HTTP_REFERER="/",
+        )
+
+    def test_repeated_adds_are_summed_in_one_line(self):
+        self.add(2)
+        self.add(3)
+        lines = Basket.objects.filter(user=self.user, product=self.product)
+        self.assertEqual(lines.count(), 1)
+        self.assertEqual(lines.get().quantity, 5)
+
+    def test_quantity_is_capped(self):
+        self.assertEqual(self.add(MAX_BASKET_QUANTITY).status_code, 302)
+        self.assertEqual(self.add(5).status_code, 302)
+        self.assertEqual(self.add(10**6).status_code, 302)
+        line = Basket.objects.get(user=self.user, product=self.product)
+        self.assertEqual(line.quantity, MAX_BASKET_QUANTITY)
+
+    def test_negative_quantity_removes_the_line(self):
+        self.add(2)
+        self.add(-(10**6))
+        self.assertFalse(Basket.objects.filter(user=self.user).exists())
+
+    def test_merged_guest_quantities_are_capped(self):
+        guest_basket = GuestBasket()
+        guest_basket.add_product(self.product.pk, MAX_BASKET_QUANTITY)
+        self.assertEqual(
+            guest_basket.add_product(self.product.pk, 5), MAX_BASKET_QUANTITY
+        )
+
+        Basket.objects.add_product(self.user, self.product.pk, 100)
+        Basket.objects.merge_quantities(self.user, guest_basket.lines)
+        line = Basket.objects.get(user=self.user, product=self.product)
+        self.assertEqual(line.quantity, MAX_BASKET_QUANTITY)
+
+
+@skipUnless(connection.vendor == "postgresql", "needs concurrent transactions")
+class ConcurrentBasketAddTests(TransactionTestCase):
+    """
+    Checks that concurrent adds of the same product are all kept in a single line.
+    """
+
+    def test_concurrent_adds(self):
+        user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        product = Product.objects.create(
+            name="Dark Bar", slug="dark-bar", description="Cocoa", price=Decimal("3.50")
+        )
+        barrier = threading.Barrier(4)
+
+        def add():
+            try:
+                barrier.wait()
+                for _ in range(10):
+                    Basket.objects.add_product(user, product.pk, 1)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=add) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        line = Basket.objects.get(user=user, product=product)
+        self.assertEqual(line.quantity, 40)
+
+
+class BasketChangeTests(TestCase):
+    """
+    Checks the JSON endpoint that changes the quantity of a basket line.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        cls.dark_bar = Product.objects.create(
+            name="Dark Bar", slug="dark-bar", description="Cocoa", price=Decimal("3.50")
+        )
+        cls.milk_bar = Product.objects.create(
+            name="Milk Bar", slug="milk-bar", description="Cocoa", price=Decimal("2.25")
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        Basket.objects.create(user=self.user, product=self.milk_bar, quantity=2)
+
+    def change(self, product_pk, quantity):
+        return self.client.post(
+            reverse("basket_change"), {"product_pk": product_pk, "quantity": quantity}
+        )
+
+    def test_response_carries_the_line_and_basket_totals(self):
+        response = self.change(self.dark_bar.pk, 3)
+        self.assertEqual(
+            response.json(),
+            {
+                "product_pk": self.dark_bar.pk,
+                "quantity": 3,
+                "line_total": "10.50",
+                "basket_total_sum": "15.00",
+                "total_after_promo": None,
+                "total_quantity": 5,
+            },
+        )
+
+    def test_quantity_dropping_to_zero_deletes_the_line(self):
+        response = self.change(self.milk_bar.pk, -2)
+        self.assertEqual(response.json()["quantity"], 0)
+        self.assertEqual(response.json()["line_total"], "0.00")
+        self.assertEqual(response.json()["total_quantity"], 0)
+        self.assertFalse(Basket.objects.filter(user=self.user).exists())
+
+    def test_invalid_quantity(self):
+        self.assertEqual(self.change(self.dark_bar.pk, "many").status_code, 400)
+
+
+class BasketUpdateTests(TestCase):
+    """
+    Checks the endpoint that sets the quantities of several basket lines at once.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        cls.dark_bar = Product.objects.create(
+            name="Dark Bar", slug="dark-bar", description="Cocoa", price=Decimal("3.50")
+        )
+        cls.milk_bar = Product.objects.create(
+            name="Milk Bar", slug="milk-bar", description="Cocoa", price=Decimal("2.25")
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        Basket.objects.create(user=self.user, product=self.milk_bar, quantity=2)
+
+    def update(self, quantities):
+        return self.client.post(
+            reverse("basket_update"),
+            {"quantities": quantities},
+            content_type="application/json",
+        )
+
+    def test_json_update_sets_and_removes_lines(self):
+        response = self.update({self.dark_bar.pk: 4, self.milk_bar.pk: 0})
+        self.assertEqual(
+            response.json(),
+            {
+                "lines": {
+                    str(self.dark_bar.pk): {"quantity": 4, "line_total": "14.00"}
+                },
+                "basket_total_sum": "14.00",
+                "total_after_promo": None,
+                "total_quantity": 4,
+            },
+        )
+        self.assertEqual(
+            dict(Basket.objects.values_list("product_id", "quantity")),
+            {self.dark_bar.pk: 4},
+        )
+
+    def test_form_update_redirects_to_the_basket(self):
+        response = self.client.post(
+            reverse("basket_update"), {f"quantity_{self.milk_bar.pk}": 5}
+        )
+        self.assertRedirects(response, reverse("basket"), fetch_redirect_response=False)
+        self.assertEqual(Basket.objects.get(user=self.user).quantity, 5)
+
+    def test_invalid_quantities_are_rejected(self):
+        self.assertEqual(self.update({self.dark_bar.pk: "many"}).status_code, 400)
+        self.assertEqual(
+            self.update({self.dark_bar.pk: MAX_BASKET_QUANTITY + 1}).status_code, 400
+        )
+        self.assertEqual(Basket.objects.get(user=self.user).quantity, 2)
+
+
+class BasketUnknownProductTests(TransactionTestCase):
+    """
+    Checks that basket changes naming a missing product are rejected.
+
+    The foreign key is only checked when the transaction commits, so these tests need real
+    transactions.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        self.product = Product.objects.create(
+            name="Dark Bar", slug="dark-bar", description="Cocoa", price=Decimal("3.50")
+        )
+        Basket.objects.create(user=self.user, product=self.product, quantity=2)
+        self.client.force_login(self.user)
+
+    def test_change_rejects_an_unknown_product(self):
+        response = self.client.post(
+            reverse("basket_change"), {"product_pk": 0, "quantity": 1}
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Basket.objects.filter(user=self.user).count(), 1)
+
+    def test_update_rejects_an_unknown_product_as_a_whole(self):
+        other = Product.objects.create(
+            name="Milk Bar", slug="milk-bar", description="Cocoa", price=Decimal("2.25")
+        )
+        response = self.client.post(
+            reverse("basket_update"),
+            {"quantities": {other.pk: 3, self.product.pk: 0, 0: 1}},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 404)
+        # The whole update runs in one transaction, so no other line changed either
+        self.assertEqual(
+            dict(Basket.objects.values_list("product_id", "quantity")),
+            {self.product.pk: 2},
+        )
+
+
+class GuestBasketTests(TestCase):
+    """
+    Checks that visitors who are not signed in see their guest basket.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = Product.objects.create(
+            name="Dark Bar",
+            slug="dark-bar",
+            description="Cocoa",
+            price=Decimal("3.50"),
+            image="products/bar.jpg",
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def add(self, quantity):
+        return self.client.post(
+            reverse("add_to_card"),
+            {"product_pk": self.product.pk, "quantity": quantity},
+            HTTP_REFERER="/",
+        )
+
+    def test_header_shows_the_guest_basket_count(self):
+        self.assertContains(self.client.get(reverse("home")), 'bubble-count">0<')
+        self.add(2)
+        response = self.client.get(reverse("home"))
+        # Not the page cached for anonymous visitors before the basket was filled
+        self.assertContains(response, 'bubble-count">2<')
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_basket_page_lists_the_guest_basket(self):
+        self.add(2)
+        response = self.client.get(reverse("basket"))
+        self.assertContains(response, "Dark Bar")
+        self.assertContains(response, "× 2")
+        self.assertContains(response, "7.00")
+
+    def test_empty_guest_basket(self):
+        self.assertContains(self.client.get(reverse("basket")), "Your cart is empty.")
+
+
+class PurgeBasketsTests(TestCase):
+    """
+    Checks that `purge_baskets` deletes only the abandoned basket lines.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        buyers = [
+            User.objects.create_user(f"buyer{number}", f"buyer{number}@example.com")
+            for number in range(2)
+        ]
+        products = [
+            Product.objects.create(
+                name=f"Bar {number}",
+                slug=f"bar-{number}",
+                description="Cocoa",
+                price=Decimal("3.50"),
+            )
+            for number in range(2)
+        ]
+        for buyer in buyers:
+            for product in products:
+                Basket.objects.create(user=buyer, product=product, quantity=1)
+        cls.fresh = Basket.objects.earliest("pk")
+        Basket.objects.exclude(pk=cls.fresh.pk).update(
+            created_timestamp=timezone.now() - timedelta(days=45)
+        )
+
+    def purge(self, *args):
+        out = StringIO()
+        call_command("purge_baskets", "--batch-size", "2", *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_deletes_nothing(self):
+        self.assertIn("Would delete 3 basket items", self.purge("--dry-run"))
+        self.assertEqual(Basket.objects.count(), 4)
+
+    def test_purge_deletes_old_lines_in_batches(self):
+        self.assertIn("Deleted 3 basket items", self.purge())
+        self.assertEqual(list(Basket.objects.all()), [self.fresh])
+
+    def test_age_threshold(self):
+        self.assertIn("Deleted 0 basket items", self.purge("--days", "60"))
+        self.assertEqual(Basket.objects.count(), 4)
+
+
+class ProductDetailQueryTests(TestCase):
+    """
+    Checks that the product page costs the same number of queries however many reviews it has.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+        reviewers = [
+            User.objects.create_user(
+                f"reviewer{number}", f"reviewer{number}@example.com"
+            )
+            for number in range(25)
+        ]
+        cls.products = {}
+        for count in (0, 1, 25):
+            product = Product.objects.create(
+                name=f"Bar {count}",
+                slug=f"bar-{count}",
+                description="Cocoa",
+                price=Decimal("3.50"),
+                image="products/bar.jpg",
+            )
+            Review.objects.bulk_create(
+                Review(product=product, user=user, text="Tasty")
+                for user in reviewers[:count]
+            )
+            cls.products[count] = product
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, count):
+        url = reverse("product_detail", args=[self.products[count].slug])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_anonymous_queries_do_not_grow_with_reviews(self):
+        self.get(0)
+        # Without reviews the paginator skips the query for the page of reviews
+        for count, queries in [(0, 4), (1, 5), (25, 5)]:
+            cache.clear()
+            with self.subTest(reviews=count), self.assertNumQueries(queries):
+                self.get(count)
+
+    def test_signed_in_queries_do_not_grow_with_reviews(self):
+        self.client.force_login(self.user)
+        self.get(0)
+        for count, queries in [(0, 5), (1, 6), (25, 6)]:
+            with self.subTest(reviews=count), self.assertNumQueries(queries):
+                self.get(count)
+
+
+class PriceFilterTests(TestCase):
+    """
+    Checks that the product list filters and sorts on the final price, discount included.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        prices = {
+            "Almond Bar": ("5.00", None),
+            "Berry Bar": ("8.00", "4.00"),
+            # A zero discount is no discount
+            "Cocoa Bar": ("6.00", "0.00"),
+            "Dark Bar": ("9.00", None),
+            "Espresso Bar": ("5.00", None),
+        }
+        cls.products = {
+            name: Product.objects.create(
+                name=name,
+                slug=name.lower().replace(" ", "-"),
+                description="Cocoa",
+                price=Decimal(price),
+                discount_price=discount and Decimal(discount),
+            )
+            for name, (price, discount) in prices.items()
+        }
+
+    def setUp(self):
+        cache.clear()
+
+    def list_products(self, **params):
+        response = self.client.get(reverse("product_list"), params)
+        return [product.name for product in response.context["products"]]
+
+    def test_price_range_uses_the_final_price(self):
+        self.assertEqual(
+            self.list_products(min_price="4.50", max_price="7"),
+            ["Almond Bar", "Cocoa Bar", "Espresso Bar"],
+        )
+        self.assertEqual(self.list_products(max_price="4"), ["Berry Bar"])
+
+    def test_sort_by_final_price(self):
+        self.assertEqual(
+            self.list_products(sort="price"),
+            ["Berry Bar", "Almond Bar", "Espresso Bar", "Cocoa Bar", "Dark Bar"],
+        )
+        # Ties are broken by id in the same direction
+        self.assertEqual(
+            self.list_products(sort="-price"),
+            ["Dark Bar", "Cocoa Bar", "Espresso Bar", "Almond Bar", "Berry Bar"],
+        )
+
+    def test_final_price_matches_get_final_price(self):
+        for product in Product.objects.all():
+            with self.subTest(product=product.name):
+                self.assertEqual(product.final_price, product.get_final_price())
+
+
+class RecountReviewsTests(TestCase):
+    """
+    Checks that `recount_reviews` repairs drifted review figures and leaves the others alone.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        reviewers = [
+            User.objects.create_user(
+                f"reviewer{number}", f"reviewer{number}@example.com"
+            )
+            for number in range(2)
+        ]
+        cls.drifted, cls.accurate = [
+            Product.objects.create(
+                name=f"Bar {number}",
+                slug=f"bar-{number}",
+                description="Cocoa",
+                price=Decimal("3.50"),
+            )
+            for number in range(2)
+        ]
+        for product in (cls.drifted, cls.accurate):
+            for user in reviewers:
+                Review.objects.create(product=product, user=user, text="Tasty")
+        cls.latest = Review.objects.filter(product=cls.drifted).latest("created_at")
+        Product.objects.filter(pk=cls.accurate.pk).update(
+            review_count=2,
+            last_reviewed_at=Review.objects.filter(product=cls.accurate)
+            .latest("created_at")
+            .created_at,
+        )
+        Product.objects.filter(pk=cls.drifted.pk).update(
+            review_count=5, last_reviewed_at=None
+        )
+
+    def recount(self, *args):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("recount_reviews", "--batch-size", "1", *args, stdout=out)
+        return out.getvalue()
+
+    def test_dry_run_only_counts(self):
+        self.assertIn("Checked 2 products, would fix 1", self.recount("--dry-run"))
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.review_count, 5)
+
+    def test_drifted_count_is_repaired(self):
+        accurate_updated_at = Product.objects.get(pk=self.accurate.pk).updated_at
+        self.assertIn("Checked 2 products, fixed 1", self.recount())
+
+        self.drifted.refresh_from_db()
+        self.assertEqual(self.drifted.review_count, 2)
+        self.assertEqual(self.drifted.last_reviewed_at, self.latest.created_at)
+        self.accurate.refresh_from_db()
+        self.assertEqual(self.accurate.updated_at, accurate_updated_at)
+        self.assertIn("fixed 0", self.recount())
+
+
+class ImportCategoriesTests(TestCase):
+    """
+    Checks that `import_categories` reports names repeated under another slug within the file.
+    """
+
+    def import_rows(self, *rows):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", encoding="utf-8", newline="", delete=False
+        ) as file:
+            writer = csv.writer(file, quoting=csv.QUOTE_ALL)
+            writer.writerow(["name", "slug", "description", "group_name"])
+            writer.writerows(rows)
+        self.addCleanup(os.remove, file.name)
+        out = StringIO()
+        err = StringIO()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_categories", file.name, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_name_repeated_under_another_slug_is_reported(self):
+        output, errors = self.import_rows(
+            ["Dark", "dark", "", "Type"],
+            ["Dark", "dark-chocolate", "", "Type"],
+        )
+        self.assertIn("Imported 1 categories in 1 groups, 1 rows failed.", output)
+        self.assertIn(
+            'Line 3: category "Dark" already has the slug "dark" on line 2.', errors
+        )
+        self.assertEqual(
+            list(ProductCategory.objects.values_list("name", "slug")),
+            [("Dark", "dark")],
+        )
+
+    def test_renamed_category_frees_its_name(self):
+        output, errors = self.import_rows(
+            ["Milk", "milk", "", "Type"],
+            ["Milky", "milk", "", "Type"],
+            ["Milk", "milk-chocolate", "", "Type"],
+        )
+        self.assertIn("Imported 2 categories in 1 groups, 0 rows failed.", output)
+        self.assertEqual(errors, "")
+        self.assertEqual(
+            dict(ProductCategory.objects.values_list("slug", "name")),
+            {"milk": "Milky", "milk-chocolate": "Milk"},
+        )
+
+
+class ImportProductsTests(TestCase):
+    """
+    Checks how `import_products` handles repeated slugs and replaced images.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        group = CategoryGroup.objects.create(name="Type")
+        ProductCategory.objects.create(name="Dark", slug="dark", group=group)
+        product = Product.objects.create(
+            name="Dark Bar",
+            slug="dark-bar",
+            description="Cocoa",
+            price=Decimal("3.50"),
+            image="products/dark.jpg",
+        )
+        # Stored directly, as saving tries to build variants from the missing image
+        cls.variants = {"source": "products/dark.jpg", "width": 640, "formats": {}}
+        Product.objects.filter(pk=product.pk).update(image_variants=cls.variants)
+
+    def import_rows(self, *rows):
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".csv", encoding="utf-8", newline="", delete=False
+        ) as file:
+            writer = csv.writer(file)
+            writer.writerow(
+                ["name", "slug", "description", "price", "image", "category_name"]
+            )
+            writer.writerows(rows)
+        self.addCleanup(os.remove, file.name)
+        out = StringIO()
+        err = StringIO()
+        call_command("import_products", file.name, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_repeated_slug_is_reported(self):
+        output, errors = self.import_rows(
+            ["Milk Bar", "milk-bar", "Cocoa", "3.00", "", "Dark"],
+            ["Milk Bar Copy", "milk-bar", "Cocoa", "4.00", "", "Dark"],
+        )
+        self.assertIn("Imported 1 products, 1 rows failed", output)
+        self.assertIn('Line 3: Slug "milk-bar" is already used on line 2.', errors)
+        self.assertEqual(Product.objects.get(slug="milk-bar").name, "Milk Bar")
+
+    def test_variants_are_kept_for_the_same_image(self):
+        self.import_rows(
+            ["Dark Bar", "dark-bar", "Cocoa", "4.00", "products/dark.jpg", "Dark"]
+        )
+        product = Product.objects.get(slug="dark-bar")
+        self.assertEqual(product.price, Decimal("4.00"))
+        self.assertEqual(product.image_variants, self.variants)
+
+    def test_variants_are_dropped_for_a_new_image(self):
+        self.import_rows(
+            ["Dark Bar", "dark-bar", "Cocoa", "3.50", "products/dark-new.jpg", "Dark"]
+        )
+        product = Product.objects.get(slug="dark-bar")
+        self.assertEqual(product.image.name, "products/dark-new.jpg")
+        self.assertEqual(product.image_variants, {})
+
+
+class LoadSeedDataTests(TestCase):
+    """
+    Checks that `load_seed_data` loads the seed once per checksum.
+    """
+
+    def load(self, *args):
+        out = StringIO()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            call_command("load_seed_data", *args, stdout=out)
+        return out.getvalue(), callbacks
+
+    def test_second_run_is_a_no_op(self):
+        output, _ = self.load()
+        self.assertIn("Loaded", output)
+        self.assertEqual(Product.objects.count(), 30)
+        self.assertEqual(SeedData.objects.count(), 1)
+        # An edit made after the load tells whether the seed was applied again
+        Product.objects.filter(slug="chocoviar-75").update(price=Decimal("9.99"))
+
+        with self.assertNumQueries(1):
+            output, callbacks = self.load()
+        self.assertIn("already loaded", output)
+        self.assertEqual(callbacks, [])
+        self.assertEqual(
+            Product.objects.get(slug="chocoviar-75").price, Decimal("9.99")
+        )
+
+    def test_force_reloads_the_seed(self):
+        self.load()
+        Product.objects.filter(slug="chocoviar-75").update(price=Decimal("9.99"))
+
+        output, callbacks = self.load("--force")
+        self.assertIn("Loaded", output)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(
+            Product.objects.get(slug="chocoviar-75").price, Decimal("3.00")
+        )
+        self.assertEqual(Product.objects.count(), 30)
+
+
+def save_test_image(name: str, size: tuple[int, int] = (1200, 900)) -> str:
+    """
+    Writes a gradient JPEG to the default storage and returns its name.
+    """
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, "JPEG")
+    return default_storage.save(name, ContentFile(buffer.getvalue()))
+
+
+class ProductImageTests(TestCase):
+    """
+    Checks when image variants are built and how they are rendered.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.image_name = save_test_image("products_images/bar.jpg")
+
+    def create_product(self) -> Product:
+        return Product.objects.create(
+            name="Bar",
+            slug="bar",
+            description="Cocoa",
+            price=Decimal("3.50"),
+            image=self.image_name,
+        )
+
+    def test_variants_are_built_after_the_save(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            product = self.create_product()
+        product.refresh_from_db()
+        self.assertEqual(product.image_variants, {})
+        with mock.patch("products.signals.threading.Thread") as thread:
+            for callback in callbacks:
+                callback()
+        thread.assert_called_once_with(
+            target=_build_image_variants_in_background,
+            args=(product.pk, self.image_name),
+            daemon=True,
+        )
+        thread.return_value.start.assert_called_once_with()
+
+        rebuild_image_variants(product.pk, self.image_name)
+        product.refresh_from_db()
+        self.assertEqual(product.image_variants["source"], self.image_name)
+        self.assertFalse(needs_image_variants(product))
+
+    def test_missing_variant_files_are_rebuilt(self):
+        product = self.create_product()
+        rebuild_image_variants(product.pk, self.image_name)
+        product.refresh_from_db()
+        for files in product.image_variants["formats"].values():
+            default_storage.delete(files[0][0])
+        self.assertTrue(needs_image_variants(product))
+
+    def test_variants_of_another_image_are_not_rendered(self):
+        product = self.create_product()
+        rebuild_image_variants(product.pk, self.image_name)
+        product.refresh_from_db()
+        product.image = "products_images/other.jpg"
+        html = render_to_string(
+            "partial/product_picture.html",
+            product_picture(product, sizes="100vw"),
+        )
+        self.assertNotIn("<source", html)
+        self.assertNotIn("width=", html)
+        self.assertNotIn("background:", html)
+        self.assertIn('src="/media/products_images/other.jpg"', html)
+
+
+class ImageVariantsBenchmarkTests(TransactionTestCase):
+    """
+    Times the bulk regeneration of image variants with `generate_image_variants`.
+    """
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = self.settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        image_names = [
+            save_test_image(f"products_images/bar-{number}.jpg") for number in range(8)
+        ]
+        # Stored without signals, as the variants are left to the command
+        Product.objects.bulk_create(
+            Product(
+                name=f"Bar {number}",
+                slug=f"bar-{number}",
+                description="Cocoa",
+                price=Decimal("3.50"),
+                image=image_name,
+            )
+            for number, image_name in enumerate(image_names)
+        )
+
+    def generate(self, *args) -> tuple[str, float]:
+        out = StringIO()
+        start = time.perf_counter()
+        call_command("generate_image_variants", "--workers", "1", *args, stdout=out)
+        return out.getvalue(), time.perf_counter() - start
+
+    def test_bulk_regeneration(self):
+        output, first_run = self.generate()
+        self.assertIn("Generated variants for 8 images, 0 failed", output)
+        self.assertFalse(
+            any(needs_image_variants(product) for product in Product.objects.all())
+        )
+
+        # Up to date variants are skipped, so a rerun only reads the products
+        output, rerun = self.generate()
+        self.assertIn("Generated variants for 0 images", output)
+        self.assertLess(rerun * 10, first_run)
+
+        output, _ = self.generate("--all")
+        self.assertIn("Generated variants for 8 images, 0 failed", output)
+
+
+class ProductSearchTests(TestCase):
+    """
+    Checks the relevance order and the query cost of the product search.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.by_name = Product.objects.create(
+            name="Hazelnut Bar",
+            slug="hazelnut-bar",
+            description="Milk chocolate",
+            price=Decimal("3.50"),
+        )
+        cls.by_description = Product.objects.create(
+            name="Milk Bar",
+            slug="milk-bar",
+            description="With roasted hazelnuts",
+            price=Decimal("3.50"),
+        )
+        cls.by_ingredients = Product.objects.create(
+            name="Praline Box",
+            slug="praline-box",
+            description="Assorted pralines",
+            price=Decimal("3.50"),
+            ingredients="Sugar, hazelnut paste",
+        )
+        Product.objects.create(
+            name="Dark Bar", slug="dark-bar", description="Cocoa", price=Decimal("3.50")
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def search(self, query):
+        return list(search_products(Product.objects.all(), query))
+
+    def test_results_are_ordered_by_relevance(self):
+        self.assertEqual(
+            self.search("hazel"),
+            [self.by_name, self.by_description, self.by_ingredients],
+        )
+
+    def test_every_word_must_match(self):
+        # Both match one word by name and one by description, so the order depends on the backend
+        self.assertCountEqual(
+            self.search("hazel milk"), [self.by_name, self.by_description]
+        )
+        self.assertEqual(self.search("hazel dark"), [])
+
+    def test_search_is_a_single_query(self):
+        # Was one sequential LIKE scan per search; the index is built once per text version
+        get_search_index()
+        with self.assertNumQueries(1):
+            self.search("bar")
+        with self.captureOnCommitCallbacks(execute=True):
+            for number in range(20):
+                Product.objects.create(
+                    name=f"Bar {number}",
+                    slug=f"bar-{number}",
+                    description="Cocoa",
+                    price=Decimal("3.50"),
+                )
+        get_search_index()
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.search("bar")), 23)
+
+    def test_results_are_paged_by_relevance(self):
+        for number in range(30):
+            Product.objects.create(
+                name=f"Bar {number}",
+                slug=f"bar-{number}",
+                description="Hazelnut",
+                price=Decimal("3.50"),
+            )
+        expected = self.search("hazel")
+        url = reverse("product_list")
+        pages = []
+        params = {"name": "hazel"}
+        while True:
+            page = self.client.get(url, params).context["page_obj"]
+            pages.append(list(page))
+            if not page.has_next():
+                break
+            params["cursor"] = page.next_cursor
+
+        self.assertEqual([len(products) for products in pages], [24, 9])
+        self.assertEqual(sum(pages, []), expected)
+        previous = self.client.get(
+            url, {"name": "hazel", "cursor": page.previous_cursor}
+        )
+        self.assertEqual(list(previous.context["page_obj"]), pages[0])
+
+    def test_index_follows_text_edits_only(self):
+        index = get_search_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.by_name.price = Decimal("4.00")
+            self.by_name.save()
+        self.assertIs(get_search_index(), index)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.by_name.name = "Walnut Bar"
+            self.by_name.save()
+        self.assertIsNot(get_search_index(), index)
+        self.assertEqual(self.search("walnut"), [self.by_name])
+
+
+class SearchBenchmarkTests(SimpleTestCase):
+    """
+    Compares the in-memory search index with a substring scan, like the former `icontains`
+    filter, over 100k generated products.
+    """
+
+    def test_index_is_faster_than_a_scan(self):
+        rng = random.Random(0)
+        words = [f"{word}{number}" for word in BENCHMARK_WORDS for number in range(25)]
+        products = [
+            SimpleNamespace(
+                pk=pk,
+                name=" ".join(rng.sample(words, 3)),
+                description=" ".join(rng.sample(words, 12)),
+                ingredients=" ".join(rng.sample(words, 4)),
+            )
+            for pk in range(100_000)
+        ]
+        index = SearchIndex(products)
+        texts = [
+            (product.pk, " ".join(getattr(product, field) for field in FIELD_WEIGHTS))
+            for product in products
+        ]
+        # Two words each in about 4% of the products, as typed in the header search field
+        queries = [" ".join(rng.sample(words, 2)) for _ in range(20)]
+
+        index_times = []
+        scan_times = []
+        for query in queries:
+            tokens = tokenize(query)
+            start = time.perf_counter()
+            found = index.search(tokens)
+            index_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            scanned = {
+                pk for pk, text in texts if all(token in text for token in tokens)
+            }
+            scan_times.append(time.perf_counter() - start)
+            # Word starts are a subset of the substrings the scan matches
+            self.assertLessEqual(found.keys(), scanned)
+
+        self.assertLess(
+            statistics.median(index_times) * 10, statistics.median(scan_times)
+        )
+
+
+class AutocompleteTests(TestCase):
+    """
+    Checks that autocomplete answers from the in-process prefix index.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        group = CategoryGroup.objects.create(name="Chocolate")
+        ProductCategory.objects.create(name="Milk", slug="milk", group=group)
+        for name in ["Milk Hazelnut Bar", "Dark Bar", "Milky Way Box"]:
+            Product.objects.create(
+                name=name,
+                slug=name.lower().replace(" ", "-"),
+                description="Cocoa",
+                price=Decimal("3.50"),
+            )
+
+    def setUp(self):
+        cache.clear()
+
+    def autocomplete(self, query):
+        response = self.client.get(reverse("autocomplete"), {"q": query})
+        return [result["name"] for result in response.json()["results"]]
+
+    def test_matches_word_starts(self):
+        self.assertEqual(
+            self.autocomplete("mil"), ["Milk", "Milk Hazelnut Bar", "Milky Way Box"]
+        )
+        self.assertEqual(self.autocomplete("hazel"), ["Milk Hazelnut Bar"])
+        self.assertEqual(self.autocomplete("  "), [])
+
+    def test_keystrokes_do_not_query_the_database(self):
+        self.autocomplete("m")
+        with self.assertNumQueries(0):
+            for query in ["mi", "mil", "milk", "milk h", "bar"]:
+                self.autocomplete(query)
+
+    def test_index_follows_the_catalog(self):
+        self.autocomplete("m")
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(
+                name="Mint Bar",
+                slug="mint-bar",
+                description="Cocoa",
+                price=Decimal("3.50"),
+            )
+        self.assertEqual(self.autocomplete("min"), ["Mint Bar"])
+
+    def test_index_is_kept_across_price_edits(self):
+        self.autocomplete("m")
+        product = Product.objects.get(slug="dark-bar")
+        product.price = Decimal("4.00")
+        with self.captureOnCommitCallbacks(execute=True):
+            product.save()
+        with self.assertNumQueries(0):
+            self.autocomplete("dar")
+
+
+class AutocompleteBenchmarkTests(SimpleTestCase):
+    """
+    Times autocomplete lookups over 100k generated product names.
+    """
+
+    def test_p99_lookup_under_2_ms(self):
+        rng = random.Random(0)
+        words = [f"{word}{number}" for word in BENCHMARK_WORDS for number in range(25)]
+        index = PrefixIndex(
+            [{"name": " ".join(rng.sample(words, 3))} for _ in range(100_000)]
+        )
+        timings = []
+        for _ in range(2000):
+            # A keystroke: the start of one or two words
+            query = " ".join(rng.sample(words, rng.randint(1, 2)))
+            query = query[: rng.randint(1, len(query))]
+            start = time.perf_counter()
+            index.search(query)
+            timings.append(time.perf_counter() - start)
+
+        self.assertLess(percentile(timings, 99), 0.002)
+
+
+class ConditionalGetTests(TestCase):
+    """
+    Checks that unchanged pages are answered with 304, except while messages are pending.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("buyer", "buyer@example.com", "password")
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+        # The first page sets the CSRF cookie, which is part of the ETag
+        self.get_index()
+
+    def get_index(self, etag=None):
+        headers = {"If-None-Match": etag} if etag else {}
+        return self.client.get(reverse("home"), headers=headers)
+
+    def test_unchanged_page_is_not_modified(self):
+        etag = self.get_index()["ETag"]
+        self.assertEqual(self.get_index(etag).status_code, 304)
+
+    def test_pending_messages_skip_the_conditional_response(self):
+        etag = self.get_index()["ETag"]
+        self.client.post(reverse("remove_promo"))
+
+        response = self.get_index(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertNotIn("ETag", response)
+
+        # The basket page shows the messages, after which the page is revalidated again
+        self.client.get(reverse("basket"))
+        self.assertEqual(self.get_index(etag).status_code, 304)
+
+
+class CategoryPageInvalidationTests(TestCase):
+    """
+    Checks that the cached category pages follow changes to the categories of their products.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        brands = CategoryGroup.objects.create(name="Brand")
+        types = CategoryGroup.objects.create(name="Type")
+        cls.acme = ProductCategory.objects.create(
+            name="Acme", slug="acme", group=brands
+        )
+        cls.white = ProductCategory.objects.create(
+            name="White", slug="white", group=types
+        )
+        cls.products = []
+        for number in range(3):
+            product = Product.objects.create(
+                name=f"Bar {number}",
+                slug=f"bar-{number}",
+                description="Cocoa",
+                price=Decimal("3.50"),
+                image="products/bar.jpg",
+            )
+            product.categories.add(cls.acme)
+            cls.products.append(product)
+        cls.products[0].categories.add(cls.white)
+        cls.products[1].categories.add(cls.white)
+
+    def setUp(self):
+        cache.clear()
+
+    def get_acme_page(self):
+        return self.client.get(reverse("category_products", args=["acme"]))
+
+    def test_cached_page_queries(self):
+        # The category, type facets, product page and navigation are queried once, then the
+        # whole page comes from the cache
+        with self.assertNumQueries(4):
+            self.get_acme_page()
+        with self.assertNumQueries(0):
+            self.assertContains(self.get_acme_page(), "White (2)")
+
+    def test_review_purges_only_the_pages_of_its_product(self):
+        white_url = reverse("category_products", args=["white"])
+        self.get_acme_page()
+        self.client.get(white_url)
+        reviewer = User.objects.create_user("reviewer", "reviewer@example.com")
+        self.client.force_login(reviewer)
+        self.client.get(white_url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(white_url)
+        cached_queries = len(queries)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("add_review", args=[self.products[2].slug]), {"text": "Tasty"}
+            )
+
+        # Bar 2 is not listed in White, whose product list and facets stay cached
+        with self.assertNumQueries(cached_queries):
+            self.client.get(white_url)
+        visitor = self.client_class()
+        with self.assertNumQueries(0):
+            visitor.get(white_url)
+        acme_url = reverse("category_products", args=["acme"])
+        self.assertContains(visitor.get(acme_url), "1 review")
+        self.assertContains(visitor.get(reverse("product_list")), "1 review")
+
+    def test_adding_a_category_to_a_product(self):
+        self.assertContains(self.get_acme_page(), "White (2)")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[2].categories.add(self.white)
+        self.assertContains(self.get_acme_page(), "White (3)")
+
+    def test_removing_a_category_from_a_product(self):
+        self.assertContains(self.get_acme_page(), "White (2)")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[1].categories.remove(self.white)
+        self.assertContains(self.get_acme_page(), "White (1)")
+
+    def test_clearing_the_categories_of_a_product(self):
+        self.assertContains(self.get_acme_page(), "Bar 0")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.products[0].categories.clear()
+        response = self.get_acme_page()
+        self.assertNotContains(response, "Bar 0")
+        self.assertContains(response, "White (1)")
+
+    def test_adding_products_to_another_category(self):
+        self.assertContains(self.get_acme_page(), "White (2)")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.white.products.add(self.products[2])
+        self.assertContains(self.get_acme_page(), "White (3)")
+
+    def test_clearing_the_products_of_another_category(self):
+        self.assertContains(self.get_acme_page(), "White (2)")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.white.products.clear()
+        self.assertNotContains(self.get_acme_page(), "White (")
+
+
+class PageCacheBenchmarkTests(TestCase):
+    """
+    Compares the requests per second of anonymous catalog pages with and without the caches.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        group = CategoryGroup.objects.create(name="Brand")
+        category = ProductCategory.objects.create(name="Acme", slug="acme", group=group)
+        for number in range(24):
+            product = Product.objects.create(
+                name=f"Bar {number}",
+                slug=f"bar-{number}",
+                description="Cocoa",
+                price=Decimal("3.50"),
+                image="products/bar.jpg",
+            )
+            product.categories.add(category)
+        cls.urls = [
+            reverse("home"),
+            reverse("product_list"),
+            reverse("category_products", args=["acme"]),
+            reverse("product_detail", args=["bar-0"]),
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def requests_per_second(self, rounds: int = 25) -> float:
+        for url in self.urls:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for url in self.urls:
+                self.client.get(url)
+        return rounds * len(self.urls) / (time.perf_counter() - start)
+
+    def test_cached_pages_are_served_faster(self):
+        dummy = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+        with self.settings(CACHES=dummy):
+            uncached = self.requests_per_second()
+        cached = self.requests_per_second()
+
+        self.assertGreater(cached, uncached * 3)
+
+
+class CatalogCacheStatsTests(TestCase):
+    """
+    Checks that the cache counters are only reported from a cache shared between processes.
+    """
+
+    def test_process_local_cache_is_refused(self):
+        with self.assertRaisesMessage(CommandError, "local to each process"):
+            call_command("catalog_cache_stats", stdout=StringIO())
+
+    def test_process_local_cache_is_reported_by_the_checks(self):
+        self.assertEqual(
+            [warning.id for warning in check_shared_cache(None)], ["products.W001"]
+        )
+
+
+class FragmentCacheTests(TestCase):
+    """
+    Checks that the product card fragment is rendered once and then served from the cache.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.product = Product.objects.create(
+            name="Bar",
+            slug="bar",
+            description="Cocoa",
+            price=Decimal("3.50"),
+            image="products/bar.jpg",
+        )
+
+    def setUp(self):
+        cache.clear()
+        # Drops the lookups other tests left uncounted in this process
+        reset_fragment_cache_stats()
+
+    def render_card(self, csrf_token: str) -> str:
+        return render_to_string(
+            "partial/product_card.html",
+            {"product": self.product, "csrf_token": csrf_token},
+        )
+
+    def test_second_render_is_a_hit(self):
+        first = self.render_card("first-token")
+        second = self.render_card("second-token")
+        flush_fragment_stats()
+
+        self.assertEqual(
+            get_fragment_cache_stats()["product_card"], {"hits": 1, "misses": 1}
+        )
+        self.assertEqual(first.replace("first-token", "second-token"), second)
+        self.assertIn('value="second-token"', second)
+
+    def test_edited_product_is_rendered_again(self):
+        self.render_card("token")
+        self.product.price = Decimal("4.00")
+        self.product.save()
+        card = self.render_card("token")
+        flush_fragment_stats()
+
+        self.assertIn("$4.00", card)
+        self.assertEqual(
+            get_fragment_cache_stats()["product_card"], {"hits": 0, "misses": 2}
+        )
@@ -9,10 +9,13 @@ urlpatterns = [
         name="category_products",
     ),
     path("product/", views.ProductListView.as_view(), name="product_list"),
+    path("autocomplete/", views.AutocompleteView.as_view(), name="autocomplete"),
     path(
         "product/<slug:slug>/", views.ProductDetailView.as_view(), name="product_detail"
     ),
     path("add-to-cart/", views.BasketAddView.as_view(), name="add_to_card"),
+    path("basket/change/", views.BasketChangeView.as_view(), name="basket_change"),
+    path("basket/update/", views.BasketUpdateView.as_view(), name="basket_update"),
     path("basket/", views.BasketListView.as_view(), name="basket"),
     path(
         "basket-delete/<int:pk>", views.BasketDeleteView.as_view(), name="basket_delete"
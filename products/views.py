@@ -1,16 +1,24 @@
+import json
+
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.paginator import Paginator
 from django.core.exceptions import ValidationError
-from django.db.models import QuerySet
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
 from django.http import (
+    Http404,
     HttpResponseRedirect,
     HttpResponseBadRequest,
     HttpRequest,
     HttpResponse,
     HttpResponseForbidden,
+    JsonResponse,
 )
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views import View
 from django.views.generic import (
     TemplateView,
@@ -22,19 +30,55 @@ from django.views.generic import (
 from django_filters.views import FilterView
 
 from accounts.forms import PromoCodeForm
-from common.views import TitleMixin, PromoCodeMixin
+from common.views import (
+    AnonymousPageCacheMixin,
+    CatalogCacheMixin,
+    KeysetPaginationMixin,
+    PromoCodeMixin,
+    TitleMixin,
+    get_promo_basket_pricing,
+)
 
-from products.filters import ProductFilterByType, ProductFilter
+from products.autocomplete import get_autocomplete_index
+from products.cache import (
+    bump_product_versions,
+    get_catalog_entry,
+    get_catalog_version,
+    get_category_version,
+    get_navigation_version,
+    get_reviews_version,
+    invalidate_basket_quantity,
+    set_basket_quantity,
+)
+from products.filters import (
+    SORT_ORDERINGS,
+    ProductFilterByType,
+    ProductFilter,
+    ProductListFilter,
+)
 from products.forms import ReviewForm
+from products.guest_basket import GuestBasket
+from products.managers import MAX_BASKET_QUANTITY
 from products.models import ProductCategory, Product, Basket, Review
+from products.pricing import clear_basket_pricing
 
 
-class CategoryProductsView(TitleMixin, FilterView):
+class CategoryProductsView(
+    TitleMixin,
+    AnonymousPageCacheMixin,
+    CatalogCacheMixin,
+    KeysetPaginationMixin,
+    FilterView,
+):
     """
     A view that displays a list of products within a specific category.
 
-    This view applies a filter to the products in the selected category based on the type (using `ProductFilterByType`).
+    This view applies a filter to the products in the selected category based on the type and price
+    (using `ProductFilterByType`).
     It retrieves the products based on the category's slug and orders them by the product's slug.
+    The products are paginated by cursor and the category and each page are served from the catalog cache.
+    Repeat requests are answered with 304 Not Modified, and anonymous visitors are served the whole page
+    from the cache, until the category, its products or the navigation change.
     """
 
     title = "Category Products"
@@ -42,6 +86,40 @@ class CategoryProductsView(TitleMixin, FilterView):
     context_object_name = "category_products"
     filterset_class = ProductFilterByType
     extra_context = {"product_name_filter": ProductFilter}
+    catalog_cache_params = ("type", "min_price", "max_price", "sort", "cursor")
+
+    def get_category(self) -> ProductCategory:
+        """
+        Returns the category selected by the slug in the URL, from the catalog cache.
+        """
+        if not hasattr(self, "category"):
+            slug = self.kwargs["slug"]
+            self.category = get_catalog_entry(
+                "category",
+                (slug,),
+                lambda: get_object_or_404(ProductCategory, slug=slug),
+                # The category itself only changes along with the navigation
+                version=get_navigation_version(),
+            )
+        return self.category
+
+    def get_conditional_validators(self) -> tuple[tuple, int]:
+        """
+        Makes the page depend on the category's product list and the navigation.
+        """
+        versions = (
+            get_category_version(self.get_category().pk),
+            get_navigation_version(),
+        )
+        return versions, max(versions) // 10**9
+
+    def get_catalog_cache_version(self) -> int:
+        """
+        Caches the product list under the latest of the page's versions, as reviews only move
+        the versions of the reviewed product's categories.
+        """
+        versions, _ = self.get_conditional_validators()
+        return max(versions)
 
     def get_queryset(self) -> QuerySet:
         """
@@ -49,8 +127,7 @@ class CategoryProductsView(TitleMixin, FilterView):
 
         The queryset filters products by the category and orders them by their slug.
         """
-        self.category = get_object_or_404(ProductCategory, slug=self.kwargs["slug"])
-        return self.category.products.all()
+        return self.get_category().products.all()
 
     def get_context_data(self, **kwargs) -> dict:
         """
@@ -63,29 +140,84 @@ class CategoryProductsView(TitleMixin, FilterView):
         return context
 
 
-class ProductListView(TitleMixin, FilterView):
+class ProductListView(
+    TitleMixin,
+    AnonymousPageCacheMixin,
+    CatalogCacheMixin,
+    KeysetPaginationMixin,
+    FilterView,
+):
     """
-    A view that displays a list of all products with an option to filter them by name.
+    A view that displays a list of all products with an option to filter them by name and price.
 
-    This view applies a filter to the list of products using the `ProductFilter` form to search for products by name.
+    This view applies a filter to the list of products using the `ProductListFilter` form to search for products
+    by name, limit them to a price range and sort them by price. The catalog is paginated by cursor, and search results by cursor in order of relevance.
+    Both are served from the catalog cache, and repeat requests are answered with 304 Not Modified, and anonymous
+    visitors are served the whole page from the cache, until the catalog or its review counts change.
 
     Attributes:
         template_name (str): The template used for rendering the view. Set to "product/list.html".
         context_object_name (str): The name of the context variable containing the filtered products.
-        filterset_class (class): The filter class used to filter products by name (`ProductFilter`).
+        filterset_class (class): The filter class used to filter products by name and price (`ProductListFilter`).
         extra_context (dict): Additional context passed to the template, in this case, `product_name_filter` for searching products by name.
     """
 
     title = "Filtered Products"
     template_name = "product/list.html"
     context_object_name = "products"
-    filterset_class = ProductFilter
+    filterset_class = ProductListFilter
     extra_context = {"product_name_filter": ProductFilter}
+    catalog_cache_params = ("name", "min_price", "max_price", "sort", "cursor")
+
+    def get_conditional_validators(self) -> tuple[tuple, int]:
+        """
+        Makes the page depend on the catalog and on the review counts it shows.
+        """
+        versions = (get_catalog_version(), get_reviews_version())
+        return versions, max(versions) // 10**9
+
+    def get_catalog_cache_version(self) -> int:
+        """
+        Caches the product list under the latest of the page's versions.
+        """
+        versions, _ = self.get_conditional_validators()
+        return max(versions)
 
+    def get_keyset_ordering(self, queryset: QuerySet) -> str:
+        """
+        Pages search results by relevance, unless another order was chosen.
+        """
+        if (
+            "rank" in queryset.query.annotations
+            and self.request.GET.get("sort") not in SORT_ORDERINGS
+        ):
+            return "-rank"
+        return super().get_keyset_ordering(queryset)
+
+
+class AutocompleteView(View):
+    """
+    A view that answers search-as-you-type queries with matching product and category names as JSON.
+
+    The matches come from an in-process prefix index, so keystroke traffic never reaches the database.
+    """
+
+    def get(self, request: HttpRequest) -> JsonResponse:
+        """
+        Returns the names, types and URLs of the entries matching the `q` query parameter.
+        """
+        results = get_autocomplete_index().search(request.GET.get("q", ""))
+        return JsonResponse({"results": results})
 
-class ProductDetailView(TitleMixin, DetailView):
+
+class ProductDetailView(TitleMixin, AnonymousPageCacheMixin, DetailView):
     """
     A view that displays the detailed information of a product, including whether the user has already submitted a review.
+
+    The product is fetched once, together with the "already reviewed" flag, and its reviews are paginated
+    with their authors joined in, so the page costs the same number of queries however many reviews there are.
+    Repeat requests are answered with 304 Not Modified, and anonymous visitors are served the whole page from the
+    cache, after a single query, until the product, its reviews or the navigation change.
     """
 
     title = "Product Detail"
@@ -96,27 +228,62 @@ class ProductDetailView(TitleMixin, DetailView):
         "product_name_filter": ProductFilter,
         "product_review_form": ReviewForm,
     }
+    reviews_paginate_by = 10
+    reviews_page_kwarg = "reviews_page"
+
+    def get_conditional_validators(self) -> tuple[tuple, int] | None:
+        """
+        Makes the page depend on the product's modification time and the navigation version only.
+        """
+        updated_at = (
+            Product.objects.filter(slug=self.kwargs["slug"])
+            .values_list("updated_at", flat=True)
+            .first()
+        )
+        if updated_at is None:
+            # Let the view answer with 404
+            return None
+        navigation_version = get_navigation_version()
+        return (
+            (updated_at, navigation_version),
+            max(int(updated_at.timestamp()), navigation_version // 10**9),
+        )
+
+    def get_queryset(self) -> QuerySet:
+        """
+        Annotates the product with whether the current user has already reviewed it.
+        """
+        queryset = super().get_queryset()
+        user = self.request.user
+        if not user.is_authenticated:
+            return queryset.annotate(user_review_exists=Value(False))
+        return queryset.annotate(
+            user_review_exists=Exists(
+                Review.objects.filter(product=OuterRef("pk"), user=user)
+            )
+        )
 
     def get_context_data(self, **kwargs) -> dict:
         """
-        Retrieves additional context data, including checking if the user has already reviewed the product.
+        Adds the current page of reviews and the "already reviewed" flag to the context.
         """
         context = super().get_context_data(**kwargs)
-        product = self.get_object()
-        if self.request.user.is_authenticated:
-            user_review_exists = Review.objects.filter(
-                user=self.request.user, product=product
-            ).exists()
-        else:
-            user_review_exists = False
-
-        context["user_review_exists"] = user_review_exists
+        reviews = self.object.reviews.select_related("user").order_by(
+            "-created_at", "-id"
+        )
+        paginator = Paginator(reviews, self.reviews_paginate_by)
+        context["reviews_page"] = paginator.get_page(
+            self.request.GET.get(self.reviews_page_kwarg)
+        )
+        context["user_review_exists"] = self.object.user_review_exists
         return context
 
 
-class BasketListView(PromoCodeMixin, TitleMixin, LoginRequiredMixin, ListView):
+class BasketListView(PromoCodeMixin, TitleMixin, ListView):
     """
     A view that displays the list of products in the user's basket, with the option to apply a promo code.
+
+    Visitors who are not signed in see their guest basket, which they can check out after signing in.
     """
 
     title = "Basket"
@@ -126,29 +293,152 @@ class BasketListView(PromoCodeMixin, TitleMixin, LoginRequiredMixin, ListView):
     extra_context = {"product_name_filter": ProductFilter, "promo_form": PromoCodeForm}
     success_url = reverse_lazy("basket")
 
-    def get_queryset(self) -> QuerySet:
+    def get_queryset(self) -> list:
         """
-        Retrieves the list of baskets associated with the current user.
+        Retrieves the basket lines of the current user or guest, already priced by `PromoCodeMixin`.
         """
-        return self.request.user.baskets.all()
+        return self.basket_pricing.lines
 
 
-class BasketAddView(LoginRequiredMixin, View):
+class BasketAddView(View):
     """
-    A view that adds a product to the user's basket. If the product is already in the basket, its quantity is updated.
+    A view that adds a product to the basket. If the product is already in the basket, its quantity is updated.
+
+    Signed-in users get their database basket updated; visitors get a guest basket that is merged
+    into their database basket when they sign in.
     """
 
     def post(self, request: HttpRequest) -> HttpResponse:
         """
         Adds a product to the basket or updates its quantity.
+
+        The change is applied with a single atomic upsert, so concurrent clicks are never lost.
         """
         user = request.user
-        product = get_object_or_404(Product, pk=request.POST["product_pk"])
+        product_pk = int(request.POST["product_pk"])
         quantity = int(request.POST["quantity"])
-        basket = Basket.objects.get_or_create(user=user, product=product)[0]
-        basket.quantity += quantity
-        basket.save()
-        return HttpResponseRedirect(request.META["HTTP_REFERER"])
+        response = HttpResponseRedirect(request.META["HTTP_REFERER"])
+
+        if not user.is_authenticated:
+            if not Product.objects.filter(pk=product_pk).exists():
+                raise Http404("No Product matches the given query.")
+            guest_basket = GuestBasket.from_request(request)
+            guest_basket.add_product(product_pk, quantity)
+            guest_basket.save(response)
+            return response
+
+        try:
+            Basket.objects.add_product(user, product_pk, quantity)
+        except IntegrityError:
+            raise Http404("No Product matches the given query.")
+        invalidate_basket_quantity(user.pk)
+        return response
+
+
+class BasketChangeView(LoginRequiredMixin, View):
+    """
+    A view that changes the quantity of a product in the user's basket and answers with JSON.
+
+    The response carries the new line total, the basket totals with and without the promo code and
+    the header count, so the basket page can be updated in place instead of being reloaded.
+    """
+
+    def post(self, request: HttpRequest) -> JsonResponse:
+        """
+        Applies the quantity change and returns the updated basket figures.
+        """
+        try:
+            product_pk = int(request.POST["product_pk"])
+            quantity = int(request.POST["quantity"])
+        except (KeyError, ValueError):
+            return HttpResponseBadRequest("Invalid product or quantity.")
+
+        try:
+            new_quantity = Basket.objects.add_product(
+                request.user, product_pk, quantity
+            )
+        except IntegrityError:
+            raise Http404("No Product matches the given query.")
+
+        clear_basket_pricing(request)
+        pricing = get_promo_basket_pricing(request)[1]
+        set_basket_quantity(request.user.pk, pricing.total_quantity)
+
+        line = next(
+            (line for line in pricing.lines if line.product_id == product_pk), None
+        )
+        return JsonResponse(
+            {
+                "product_pk": product_pk,
+                "quantity": new_quantity,
+                "line_total": str(pricing.line_total(line)) if line else "0.00",
+                **pricing.totals_json(),
+            }
+        )
+
+
+class BasketUpdateView(LoginRequiredMixin, View):
+    """
+    A view that sets the quantities of several basket lines in one request.
+
+    It accepts either a JSON body of the form `{"quantities": {product_pk: quantity}}`, answered with
+    the updated basket as JSON, or an "update cart" form with `quantity_<product_pk>` fields, which
+    redirects back to the basket. A quantity of zero removes the line.
+    """
+
+    max_quantity = MAX_BASKET_QUANTITY
+
+    def post(self, request: HttpRequest) -> HttpResponse:
+        """
+        Applies all quantity changes in a single transaction and returns the recomputed basket.
+        """
+        try:
+            quantities = self.get_quantities(request)
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return HttpResponseBadRequest("Invalid products or quantities.")
+
+        try:
+            Basket.objects.set_quantities(request.user, quantities)
+        except IntegrityError:
+            raise Http404("No Product matches the given query.")
+
+        clear_basket_pricing(request)
+        pricing = get_promo_basket_pricing(request)[1]
+        set_basket_quantity(request.user.pk, pricing.total_quantity)
+
+        if request.content_type != "application/json":
+            return redirect("basket")
+
+        return JsonResponse(
+            {
+                "lines": {
+                    line.product_id: {
+                        "quantity": line.quantity,
+                        "line_total": str(pricing.line_total(line)),
+                    }
+                    for line in pricing.lines
+                },
+                **pricing.totals_json(),
+            }
+        )
+
+    def get_quantities(self, request: HttpRequest) -> dict[int, int]:
+        """
+        Reads the {product_pk: quantity} mapping from the JSON body or the submitted form.
+        """
+        if request.content_type == "application/json":
+            items = json.loads(request.body)["quantities"].items()
+        else:
+            items = (
+                (key.removeprefix("quantity_"), value)
+                for key, value in request.POST.items()
+                if key.startswith("quantity_")
+            )
+
+        quantities = {int(pk): int(quantity) for pk, quantity in items}
+        if any(quantity > self.max_quantity for quantity in quantities.values()):
+            raise ValueError("Quantity is too large.")
+        return quantities
 
 
 class BasketDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
@@ -167,6 +457,14 @@ class BasketDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         basket = self.get_object()
         return basket.user == self.request.user
 
+    def form_valid(self, form) -> HttpResponse:
+        """
+        Deletes the basket item and refreshes the user's cached basket quantity.
+        """
+        response = super().form_valid(form)
+        invalidate_basket_quantity(self.request.user.pk)
+        return response
+
 
 class ReviewCreateView(LoginRequiredMixin, FormView):
     """
@@ -194,10 +492,21 @@ class ReviewCreateView(LoginRequiredMixin, FormView):
     def form_valid(self, form: ReviewForm) -> HttpResponse:
         """
         Saves the review and associates it with the current user and product.
+        The product's review count and latest review date are updated in the same transaction.
         """
         form.instance.user = self.request.user
         form.instance.product = self.product
-        form.save()
+        with transaction.atomic():
+            review = form.save()
+            Product.objects.filter(pk=self.product.pk).update(
+                review_count=F("review_count") + 1,
+                last_reviewed_at=Greatest(
+                    Coalesce("last_reviewed_at", Value(review.created_at)),
+                    Value(review.created_at),
+                ),
+                updated_at=timezone.now(),
+            )
+            transaction.on_commit(lambda: bump_product_versions(self.product.pk))
 
         messages.success(self.request, "Your review has been submitted successfully.")
         return super().form_valid(form)
@@ -231,6 +540,27 @@ class ReviewDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
         messages.success(self.request, "Your review has been deleted successfully.")
         return reverse_lazy("product_detail", kwargs={"slug": self.object.product.slug})
 
+    def form_valid(self, form) -> HttpResponse:
+        """
+        Deletes the review and updates the product's review count and latest review date
+        in the same transaction.
+        """
+        with transaction.atomic():
+            response = super().form_valid(form)
+            latest = (
+                Review.objects.filter(product=self.object.product_id)
+                .order_by("-created_at")
+                .values("created_at")[:1]
+            )
+            Product.objects.filter(pk=self.object.product_id).update(
+                review_count=Greatest(F("review_count") - 1, Value(0)),
+                last_reviewed_at=Subquery(latest),
+                updated_at=timezone.now(),
+            )
+            product_pk = self.object.product_id
+            transaction.on_commit(lambda: bump_product_versions(product_pk))
+        return response
+
     def test_func(self) -> bool:
         """
         Ensures that the user is the owner of the review before allowing deletion.
@@ -3,8 +3,33 @@ document.addEventListener("DOMContentLoaded", function () {
     let increaseButtons = document.querySelectorAll(".plus-btn");
     let quantityInputs = document.querySelectorAll(".quantity-input");
 
+    function setText(selector, value) {
+        document.querySelectorAll(selector).forEach(function (element) {
+            element.textContent = value;
+        });
+    }
+
+    function applyBasket(data) {
+        // Обновляем строку корзины, итоги и счетчик в шапке без перезагрузки
+        if (data.total_quantity === 0) {
+            location.reload();
+            return;
+        }
+        let quantityInput = document.querySelector(`input[data-product-id='${data.product_pk}']`);
+        if (data.quantity === 0) {
+            document.querySelector(`[data-basket-line='${data.product_pk}']`).remove();
+        } else if (quantityInput) {
+            quantityInput.value = data.quantity;
+            quantityInput.defaultValue = data.quantity;
+        }
+        setText("[data-basket-total-sum]", data.basket_total_sum);
+        setText("[data-total-after-promo]", data.total_after_promo);
+        setText("[data-checkout-total]", data.total_after_promo || data.basket_total_sum);
+        setText(".header__cart-count", data.total_quantity);
+    }
+
     function updateCart(productId, changeInQuantity) {
-        fetch(addToCartUrl, {
+        fetch(basketChangeUrl, {
             method: "POST",
             headers: {
                 "Content-Type": "application/x-www-form-urlencoded",
@@ -13,7 +38,7 @@ document.addEventListener("DOMContentLoaded", function () {
             body: `product_pk=${productId}&quantity=${changeInQuantity}`
         }).then(response => {
             if (response.ok) {
-                location.reload();  // Перезагружаем страницу
+                return response.json().then(applyBasket);
             } else {
                 console.error("Ошибка обновления корзины");
             }
@@ -47,7 +72,7 @@ document.addEventListener("DOMContentLoaded", function () {
     quantityInputs.forEach(function (input) {
         input.addEventListener("change", function () {
             let productId = this.dataset.productId;
-            let newQuantity = Math.max(1, parseInt(this.value));
+            let newQuantity = Math.max(1, parseInt(this.value) || 1);
             this.value = newQuantity;
             updateCart(productId, newQuantity - parseInt(this.defaultValue));  // Отправляем изменение количества
         });
@@ -56,4 +81,4 @@ document.addEventListener("DOMContentLoaded", function () {
     function getCSRFToken() {
         return document.querySelector("[name=csrfmiddlewaretoken]").value;
     }
-});
\ No newline at end of file
+});
@@ -0,0 +1,35 @@
+document.addEventListener("DOMContentLoaded", function () {
+    let searchField = document.querySelector(".search-field");
+    if (!searchField) {
+        return;
+    }
+
+    // Подсказки поиска показываем через datalist, форма отправляется как обычно
+    let suggestions = document.createElement("datalist");
+    suggestions.id = "search-suggestions";
+    searchField.setAttribute("list", suggestions.id);
+    searchField.setAttribute("autocomplete", "off");
+    searchField.after(suggestions);
+
+    let timer = null;
+    searchField.addEventListener("input", function () {
+        clearTimeout(timer);
+        let query = this.value.trim();
+        if (query === "") {
+            suggestions.replaceChildren();
+            return;
+        }
+        timer = setTimeout(function () {
+            fetch(`${searchField.form.dataset.autocompleteUrl}?q=${encodeURIComponent(query)}`)
+                .then(response => response.json())
+                .then(data => {
+                    suggestions.replaceChildren(...data.results.map(function (result) {
+                        let option = document.createElement("option");
+                        option.value = result.name;
+                        return option;
+                    }));
+                })
+                .catch(error => console.error("Ошибка:", error));
+        }, 150);
+    });
+});